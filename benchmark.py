@@ -0,0 +1,421 @@
+#!/usr/bin/python
+
+"""Benchmarks for GC log parsing & analysis
+
+Usage: python benchmark.py [benchmark ...] [--events=N]
+
+Synthetic logs are generated from representative GC entries, with the
+size of the log controlled by the number of events (use a large value
+such as --events=20000000 to generate a multi-GB log).
+"""
+
+import itertools
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import parsegc
+import stats
+
+from parsegc import ParseGCLog
+
+
+# Representative log lines, %(ts)s is substituted with the entry timestamp
+LOG_TEMPLATES = [
+    "%(ts)s: [GC %(ts)s: [ParNew: 471872K->52416K(471872K), 0.0588490 secs] 3573462K->3178709K(4141888K), 0.0595410 secs] [Times: user=1.00 sys=0.05, real=0.06 secs] ",
+    "%(ts)s: Total time for which application threads were stopped: 0.0597720 seconds",
+    "%(ts)s: [GC %(ts)s: [ParNew: 471872K->50716K(471872K), 0.0358990 secs] 3614233K->3212276K(4141888K), 0.0365000 secs] [Times: user=0.69 sys=0.01, real=0.04 secs] ",
+    "%(ts)s: [CMS-concurrent-mark-start]",
+    "%(ts)s: [GC [1 CMS-initial-mark: 1860555K(3670016K)] 1911295K(4141888K), 0.0331270 secs] [Times: user=0.03 sys=0.01, real=0.03 secs] ",
+    "%(ts)s: [Full GC %(ts)s: [CMS: 458751K->458751K(458752K), 2.2371750 secs] 517759K->517722K(517760K), [CMS Perm : 4619K->4609K(21248K)], 2.2372395 secs] [Times: user=2.17 sys=0.05, real=2.23 secs] ",
+    "%(ts)s: [GC [PSYoungGen: 83708K->58240K(116480K)] 351227K->351398K(466048K), 0.2748461 secs] [Times: user=0.93 sys=0.04, real=0.27 secs] ",
+]
+
+DEFAULT_EVENTS = 200000
+
+# Numbers of events summarised by the stats benchmark
+STATS_EVENTS = (1000000, 10000000)
+
+# Worker counts of the parallel benchmark
+PARALLEL_WORKERS = (1, 2, 4)
+
+# Number of events of the GC overhead benchmark, as re-summing each 
+# window is quadratic in the events per window
+OVERHEAD_EVENTS = 20000
+
+
+def generate_log(events, filename=None):
+    """Write a synthetic GC log containing events lines, returning its name"""
+    if filename is None:
+        fd, filename = tempfile.mkstemp(suffix=".log")
+        os.close(fd)
+    with open(filename, "w") as gclog:
+        for i in range(events):
+            template = LOG_TEMPLATES[i % len(LOG_TEMPLATES)]
+            gclog.write(template % {'ts': '%.3f' % (i * 0.125)} + "\n")
+    return filename
+
+
+def timed(func, *args, **kwargs):
+    """Return (result, elapsed secs) of invoking func"""
+    start = time.time()
+    result = func(*args, **kwargs)
+    return result, time.time() - start
+
+
+def best_of(repeat, func, *args, **kwargs):
+    """Return (result, fastest elapsed secs) of repeat invocations of func"""
+    return min((timed(func, *args, **kwargs) for i in range(repeat)), 
+        key=lambda result: result[1])
+
+
+def report(name, elapsed, baseline=None):
+    line = "  %-40s %8.3f secs" % (name, elapsed)
+    if baseline:
+        line += "  (%.2fx)" % (baseline / elapsed)
+    sys.stdout.write(line + "\n")
+
+
+def _count_entries(parse_method, filename):
+    """Consume a parse generator in a child process, returning the 
+    elapsed time & peak resident memory (KB) of parsing filename
+    """
+    parser = ParseGCLog()
+    start = time.time()
+    for entry in getattr(parser, parse_method)(filename):
+        pass
+    return (time.time() - start, 
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def measure_in_child(parse_method, filename):
+    pool = multiprocessing.Pool(1)
+    try:
+        return pool.apply(_count_entries, (parse_method, filename))
+    finally:
+        pool.close()
+        pool.join()
+
+
+def bench_mmap(filename):
+    """Text iter_parse_file vs mmap iter_parse_mmap, best of 3 children"""
+    baseline, rss = min(measure_in_child('iter_parse_file', filename) 
+        for i in range(3))
+    report("iter_parse_file (peak %d KB)" % rss, baseline)
+    elapsed, rss = min(measure_in_child('iter_parse_mmap', filename) 
+        for i in range(3))
+    report("iter_parse_mmap (peak %d KB)" % rss, elapsed, baseline)
+
+
+def _raw_fields(filename):
+    """Captured field tuples of each entry kind in filename"""
+    parser = ParseGCLog()
+    raw = [[] for kind in parsegc.KINDS]
+    with open(filename) as gclog:
+        for line in parsegc.iter_lines(gclog):
+            matched = parser._match_span(line, 0, len(line), 
+                parser._dispatch, parser._handlers)
+            if matched:
+                branch, ts, datestamp, entry = matched
+                kind = parsegc.BRANCH_KINDS[branch]
+                raw[kind].append((ts,) + entry.group(*parsegc.GROUPS[kind])
+                    + (datestamp,))
+    return raw
+
+
+def bench_convert(filename):
+    """Per event field conversion cost, per entry vs batched by column"""
+    raw = _raw_fields(filename)
+    events = float(sum(len(rows) for rows in raw))
+    batches = [[rows[start:start + parsegc.BATCH_SIZE] for rows in raw]
+        for start in range(0, max(len(rows) for rows in raw), 
+            parsegc.BATCH_SIZE)]
+
+    def per_entry():
+        decode = parsegc.DatestampDecoder()
+        for row in raw[parsegc.YG_KIND]:
+            parsegc.generate_yg_gc_entry(*row[:-1], 
+                wall_time=decode(row[-1]))
+        for row in raw[parsegc.FULL_KIND]:
+            parsegc.generate_full_gc_entry(*row[:-1], 
+                wall_time=decode(row[-1]))
+
+    def batched_convert():
+        return [parsegc._convert_batch(batch) for batch in batches]
+
+    def batched():
+        for columns in batched_convert():
+            for kind in parsegc.KINDS:
+                for row in zip(*columns[kind]):
+                    parsegc.ENTRY_TYPES[kind](*row)
+
+    def per_event(elapsed):
+        return "%.2f usecs/event" % (elapsed * 1e6 / events)
+
+    result, baseline = best_of(3, per_entry)
+    report("per entry, with build (%s)" % per_event(baseline), baseline)
+    for name, func in (("batched", batched_convert), 
+            ("batched, with build", batched)):
+        result, elapsed = best_of(3, func)
+        report("%s (%s)" % (name, per_event(elapsed)), elapsed, baseline)
+        if parsegc.numpy is not None:
+            numpy, parsegc.numpy = parsegc.numpy, None
+            try:
+                result, elapsed = best_of(3, func)
+            finally:
+                parsegc.numpy = numpy
+            report("%s, no NumPy (%s)" % (name, per_event(elapsed)), 
+                elapsed, baseline)
+
+
+def bench_parallel(filename):
+    """Serial parse_file vs parse_file_parallel & its speedup by workers"""
+    parser = ParseGCLog()
+    expected, baseline = best_of(3, parser.parse_file, filename)
+    report("parse_file (%d CPUs)" % multiprocessing.cpu_count(), baseline)
+
+    single = None
+    for workers in PARALLEL_WORKERS:
+        result, elapsed = best_of(3, parser.parse_file_parallel, filename, 
+            workers)
+        assert result == expected
+        single = single or elapsed
+        report("parse_file_parallel(%d) (%.2fx of 1)" % (workers, 
+            single / elapsed), elapsed, baseline)
+    for workers in PARALLEL_WORKERS:
+        result, elapsed = best_of(3, parser.parse_file_parallel, filename, 
+            workers, columnar=True)
+        report("parse_file_parallel(%d), columnar" % workers, elapsed, 
+            baseline)
+
+
+def bench_dispatch(filename):
+    """parse_file lines/sec & the parser's diagnostics"""
+    parser = ParseGCLog()
+    result, elapsed = timed(parser.parse_file, filename)
+    lines = sum(parser.dispatch_counts.values())
+    report("parse_file (%d lines/sec)" % (lines / elapsed), elapsed)
+    sys.stdout.write("  %-32s %r\n" % ("profile", parser.log_profile))
+    for branch, count in sorted(parser.dispatch_counts.items()):
+        sys.stdout.write("  %-32s %8d lines\n" % (branch, count))
+    diagnostics = parser.diagnostics
+    sys.stdout.write("  %-32s %8d lines\n" % ("unmatched", 
+        diagnostics.unmatched))
+    sys.stdout.write("  %-32s %8d bytes\n" % ("scanned", 
+        diagnostics.bytes_scanned))
+    for stage, elapsed in sorted(diagnostics.stage_times.items()):
+        sys.stdout.write("  %-32s %8.3f secs\n" % (stage, elapsed))
+
+
+def bench_range(filename):
+    """Full parse_file vs bisected & indexed parsing of a 1% window"""
+    parser = ParseGCLog()
+    entries, baseline = timed(parser.parse_file, filename)
+    report("parse_file", baseline)
+    t_start = entries[len(entries) // 2].timestamp
+    t_end = t_start + (entries[-1].timestamp - entries[0].timestamp) / 100
+    result, elapsed = best_of(3, parser.parse_file, filename, 
+        start=t_start, end=t_end)
+    report("parse_file, bisected (%d entries)" % len(result), elapsed, 
+        baseline)
+
+    result, elapsed = timed(parser.parse_file, filename, index=True)
+    report("parse_file, building index", elapsed, baseline)
+    result, elapsed = best_of(3, parser.parse_range, filename, t_start, 
+        t_end)
+    report("parse_range (%d entries)" % len(result), elapsed, baseline)
+    os.remove(parsegc.index_path(filename))
+
+
+def bench_lazy(filename):
+    """Eager vs lazy entries, reading only the pauses or every field"""
+    def total_pause(lazy):
+        return sum(entry.pause_time for entry in 
+            ParseGCLog(lazy=lazy).iter_parse_file(filename))
+
+    def all_fields(lazy):
+        return [entry.as_tuple() for entry in 
+            ParseGCLog(lazy=lazy).iter_parse_file(filename)]
+
+    for name, func in (("pause_time only", total_pause), 
+            ("all fields", all_fields)):
+        result, baseline = best_of(3, func, False)
+        report("eager, %s" % name, baseline)
+        result, elapsed = best_of(3, func, True)
+        report("lazy, %s" % name, elapsed, baseline)
+
+
+def bench_tokenizer(filename):
+    """Entry patterns vs the tokenizers, parsing & per entry match time"""
+    for name, func in (("parse_file", lambda parser: 
+            parser.parse_file(filename)), ("iter_parse_batched", 
+            lambda parser: list(parser.iter_parse_batched(open(filename))))):
+        expected, baseline = best_of(3, func, ParseGCLog())
+        report("patterns, %s" % name, baseline)
+        result, elapsed = best_of(3, func, ParseGCLog(tokenizer=True))
+        assert result == expected
+        report("tokenizer, %s" % name, elapsed, baseline)
+
+    with open(filename) as gclog:
+        entries = [line.split(": ", 1)[1] for line in 
+            itertools.islice(gclog, len(LOG_TEMPLATES))]
+    for name, pattern, tokenize in (
+            ("young GC", parsegc.yg_gc_entry, parsegc.tokenize_yg_gc), 
+            ("full GC", parsegc.full_gc_entry, parsegc.tokenize_full_gc)):
+        line = next(entry for entry in entries if pattern.match(entry))
+        lines = [line] * 100000
+        result, baseline = best_of(3, lambda: [pattern.match(line) 
+            for line in lines])
+        report("%s pattern match" % name, baseline)
+        result, elapsed = best_of(3, lambda: [tokenize(line) 
+            for line in lines])
+        report("%s tokenize" % name, elapsed, baseline)
+
+
+def adversarial_lines(length):
+    """Corrupt & pathological lines of about length characters, each 
+    reaching the entry patterns of their dispatch branch
+    """
+    entry = LOG_TEMPLATES[5] % {'ts': '1.000'}
+    return [
+        "1.000: [Full GC " + "1" * length,
+        "1.000: [Full GC 1.000: " + "[CMS: 1K->1K(1K)] " * (length // 18),
+        "1.000: [GC " + " " * length + "x",
+        entry[:len(entry) // 2] + "[A " * (length // 3),
+        entry + " " * length,
+        "1" * (length // 2) + "." + "1" * (length // 2),
+        "1.000: [GC " + "".join(chr(i % 128) for i in range(length)),
+    ]
+
+
+def bench_adversarial(filename):
+    """Worst per line parse cost of adversarial lines, unguarded vs guarded"""
+    def worst(lines):
+        parser = ParseGCLog()
+        return max(best_of(3, parser.parse, line)[1] for line in lines)
+
+    for length in (1 << 10, 1 << 14, 1 << 18, 1 << 22):
+        lines = adversarial_lines(length)
+        baseline = worst(lines)
+        max_length, parsegc.MAX_LINE_LENGTH = parsegc.MAX_LINE_LENGTH, \
+            sys.maxsize
+        try:
+            elapsed = worst(lines)
+        finally:
+            parsegc.MAX_LINE_LENGTH = max_length
+        report("%d chars, unguarded (%.1f usecs)" % (length, elapsed * 1e6), 
+            elapsed)
+        report("%d chars, guarded (%.1f usecs)" % (length, baseline * 1e6), 
+            baseline, elapsed)
+
+
+def _tiled_frame(frame, rows):
+    """GCFrame of the rows of frame repeated to at least rows rows"""
+    repeats = -(-rows // len(frame))
+    tiled = parsegc.GCFrame()
+    tiled.collectors = list(frame.collectors)
+    tiled._collector_codes = dict(frame._collector_codes)
+    tiled.kind = frame.kind * repeats
+    tiled.collector = frame.collector * repeats
+    tiled.system = frame.system * repeats
+    for name, column in frame.columns.items():
+        tiled.columns[name] = column * repeats
+    return tiled
+
+
+def bench_stats(filename):
+    """SummaryStats of entries vs vectorised SummaryStats.from_frame"""
+    frame = ParseGCLog().parse_file(filename, columnar=True)
+    entries = list(frame)
+    for events in STATS_EVENTS:
+        repeats = -(-events // len(entries))
+        summary, baseline = timed(stats.SummaryStats, entries * repeats)
+        report("SummaryStats, %d events" % (len(entries) * repeats),
+            baseline)
+        tiled = _tiled_frame(frame, events)
+        result, elapsed = best_of(3, stats.SummaryStats.from_frame, tiled)
+        assert list(result.stats.items()) == list(summary.stats.items())
+        report("SummaryStats.from_frame, %d events" % len(tiled), elapsed,
+            baseline)
+
+
+def _resummed_overhead(entries, window):
+    """Worst GC overhead of the windows ending at each pause, summing the 
+    pauses of each window
+    """
+    # (start, end) of each pause, excluding any overlap with those before
+    pauses = []
+    end = float('-inf')
+    for entry in entries:
+        start = max(entry.timestamp, end)
+        end = max(end, entry.timestamp + entry.pause_time)
+        pauses.append((start, end))
+    worst = 0.0
+    for i, (start, end) in enumerate(pauses):
+        window_start = end - window
+        paused = 0.0
+        j = i
+        while j >= 0 and pauses[j][1] > window_start:
+            paused += pauses[j][1] - max(pauses[j][0], window_start)
+            j -= 1
+        worst = max(worst, paused / window)
+    return worst
+
+
+def _window_overhead(entries, window):
+    overhead = stats.WindowStats(window)
+    for entry in entries:
+        overhead.process(entry)
+    return overhead.max_overhead
+
+
+def bench_overhead(filename):
+    """Sliding window GC overhead, re-summed vs two-pointer WindowStats"""
+    entries = ParseGCLog().parse_file(filename)[:OVERHEAD_EVENTS]
+    for window in stats.OVERHEAD_WINDOWS:
+        expected, baseline = best_of(3, _resummed_overhead, entries, window)
+        report("%gs windows, re-summed" % window, baseline)
+        worst, elapsed = best_of(3, _window_overhead, entries, window)
+        assert abs(worst - expected) < 1e-9
+        report("%gs windows, WindowStats" % window, elapsed, baseline)
+
+
+BENCHMARKS = {
+    'adversarial': bench_adversarial,
+    'convert': bench_convert,
+    'dispatch': bench_dispatch,
+    'lazy': bench_lazy,
+    'mmap': bench_mmap,
+    'overhead': bench_overhead,
+    'parallel': bench_parallel,
+    'range': bench_range,
+    'stats': bench_stats,
+    'tokenizer': bench_tokenizer,
+}
+
+
+def main(args):
+    events = DEFAULT_EVENTS
+    names = []
+    for arg in args:
+        if arg.startswith("--events="):
+            events = int(arg.split("=", 1)[1])
+        else:
+            names.append(arg)
+
+    filename = generate_log(events)
+    try:
+        sys.stdout.write("%d events, %.1f MB\n" %
+            (events, os.path.getsize(filename) / float(1 << 20)))
+        for name in names or sorted(BENCHMARKS):
+            sys.stdout.write(name + ": " + BENCHMARKS[name].__doc__ + "\n")
+            BENCHMARKS[name](filename)
+    finally:
+        os.remove(filename)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
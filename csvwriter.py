@@ -1,4 +1,5 @@
 import csv
+import itertools
 import sys
 
 # Required for unit testing purposes
@@ -34,13 +35,20 @@ class CSVResultWriter(object):
         """
 
     def write_csv_data(self, result_set, file):
-        """Write csv data indexed by time series"""
+        """Write csv data indexed by time series
+
+        result_set may be any iterable, such as a generator, so results 
+        are written out as they are produced rather than held in memory
+        """
+        result_set = iter(result_set)
+        first = next(result_set)
+
         # Write our headers
-        file.write(result_set[0].time_series_key + ',' + 
-            ','.join(result_set[0].result_attr.keys()) + '\n')
+        file.write(first.time_series_key + ',' + 
+            ','.join(first.result_attr.keys()) + '\n')
 
         # Write our data - need to ensure None value is not written as "None"
-        for entry in result_set:
+        for entry in itertools.chain([first], result_set):
             file.write(xstr(entry.time_series_value) + ',' + 
                 ','.join(map(xstr, entry.result_attr.values())) + '\n')
 
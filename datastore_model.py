@@ -42,8 +42,12 @@ of GC related objects.
 We use the polymodel class to provide a superclass data model definition 
 """
 class GCModel(polymodel.PolyModel):
-    collector = db.StringProperty(required=True)
+    # Code of the collector in parsegc.COLLECTORS, with the collector 
+    # name only stored if it has no code (or the entity predates codes)
+    collector_code = db.IntegerProperty()
+    collector = db.StringProperty()
     timestamp = db.FloatProperty(required=True)
+    wall_time = db.FloatProperty(default=0.0)
 
 
 class YoungGenGCModel(GCModel):
@@ -96,14 +96,19 @@ class AnalyseLog(webapp2.RequestHandler):
         start = time.time()
 
         #file = self.request.body_file
-        file = self.request.params["gclog"].file
+        uploads = self.request.POST.getall("gclog")
 
         log_key = LogData(
-            filename=self.request.POST["gclog"].filename,
+            filename=", ".join(upload.filename for upload in uploads),
             notes=self.request.get("notes")).put()
 
-        parser = ParseGCLog()
-        gc_results = parser.parse_data(file)
+        parser = ParseGCLog(cache=gc_datastore.MemcacheParseCache())
+        if len(uploads) == 1:
+            gc_results = parser.parse_data(uploads[0].file)
+        else:
+            # Rotated files of a log, merged into a single ordered log
+            gc_results = [entry for source, entry in parser.iter_merge(
+                {log_key: [upload.file for upload in uploads]})]
 
         if len(gc_results) > 0:
 
@@ -146,6 +151,16 @@ class AnalyseLog(webapp2.RequestHandler):
                 graph.MEMORY_UTIL_POST, 
                 gc_results, 
                 blob_writer)
+
+            allocation_rate_blob_key = graph.generate_cached_graph(log_key, 
+                graph.ALLOCATION_RATE, 
+                gc_results, 
+                blob_writer)
+
+            gc_overhead_blob_key = graph.generate_cached_graph(log_key, 
+                graph.GC_OVERHEAD, 
+                gc_results, 
+                blob_writer)
             
             duration = time.time() - start
 
@@ -157,12 +172,15 @@ class AnalyseLog(webapp2.RequestHandler):
                 'name': '/uploads',
                 'results_key': str(results_csv_key),
                 'summary_stats': summary_stats,
+                'diagnostics': parser.diagnostics,
                 'gc_results': gc_results,
                 'yg_memory_key': str(yg_memory_blob_key),
                 'full_memory_key': str(full_memory_blob_key),
                 'gc_duration_key': str(gc_duration_blob_key),
                 'gc_reclaimed_key': str(gc_reclaimed_blob_key),
-                'memory_util_post_key': str(memory_util_post_blob_key)
+                'memory_util_post_key': str(memory_util_post_blob_key),
+                'allocation_rate_key': str(allocation_rate_blob_key),
+                'gc_overhead_key': str(gc_overhead_blob_key)
             }
 
             template = jinja_environment.get_template(
@@ -242,7 +260,11 @@ class GetUploadHandler(webapp2.RequestHandler):
         q = db.GqlQuery("SELECT * FROM GraphModel " +
                 "WHERE ANCESTOR IS :1 ", key)
 
-        results = q.fetch(6)
+        results = q.fetch(None)
+
+        # Uploads predating a graph type have no graph of it
+        allocation_rate_key = None
+        gc_overhead_key = None
 
         for entry in results:
             if entry.graph_type == graph.RAW_CSV_DATA:
@@ -257,6 +279,10 @@ class GetUploadHandler(webapp2.RequestHandler):
                 full_memory_key = str(entry.blob_key.key())
             elif entry.graph_type == graph.MEMORY_UTIL_POST:
                 memory_util_post_key = str(entry.blob_key.key())
+            elif entry.graph_type == graph.ALLOCATION_RATE:
+                allocation_rate_key = str(entry.blob_key.key())
+            elif entry.graph_type == graph.GC_OVERHEAD:
+                gc_overhead_key = str(entry.blob_key.key())
 
         duration = time.time() - start
 
@@ -273,7 +299,9 @@ class GetUploadHandler(webapp2.RequestHandler):
             'full_memory_key': full_memory_key,
             'gc_duration_key': gc_duration_key,
             'gc_reclaimed_key': gc_reclaimed_key,
-            'memory_util_post_key': memory_util_post_key
+            'memory_util_post_key': memory_util_post_key,
+            'allocation_rate_key': allocation_rate_key,
+            'gc_overhead_key': gc_overhead_key
         }
 
         template = jinja_environment.get_template(
@@ -2,10 +2,24 @@
 import sys
 sys.path = sys.path + ['/usr/local/google_appengine', '/usr/local/google_appengine/lib/yaml/lib', '/usr/local/google_appengine/google/appengine']
 
+from StringIO import StringIO
+
+from google.appengine.api import memcache
 from google.appengine.ext import db
 
 from datastore_model import  FullGCModel, YoungGenGCModel
-from parsegc import FullGCEntry, YoungGenGCEntry
+from parsegc import FullGCEntry, GCFrame, ParseGCException, YoungGenGCEntry
+from parsegc import collector_code, collector_name, intern_collector
+
+# memcache values are limited to 1MB, so cached frames are split in chunks
+MEMCACHE_CHUNK_SIZE = 1000000
+
+# Chunks written per memcache call, as each call is limited to 32MB
+MEMCACHE_BATCH_CHUNKS = 8
+
+# Bound on the chunks of a cached frame, larger frames aren't cached 
+# rather than evicting much of the cache
+MEMCACHE_MAX_CHUNKS = 32
 
 
 def get_data(gc_key):
@@ -32,8 +46,12 @@ def get_data(gc_key):
     return gc_data
 
 
-def store_data(gc_key, gc_data):
-    """Persist GC data entries"""
+def store_data(gc_key, gc_data, size=1000):
+    """Persist GC data entries
+
+    Entries are written in batches as gc_data is consumed, so a 
+    generator such as ParseGCLog.iter_parse can be passed directly
+    """
     # Batch model entities for persistence
     yg_results = []
     full_results = []
@@ -41,19 +59,74 @@ def store_data(gc_key, gc_data):
     for entry in gc_data:
         if isinstance(entry, YoungGenGCEntry):
             yg_results.append(_create_yg_model(gc_key, entry))
-            """if len(yg_results) >= 1000:
+            if len(yg_results) >= size:
                 db.put(yg_results)
-                yg_results = []"""
+                yg_results = []
         elif isinstance(entry, FullGCEntry):
             full_results.append(_create_full_model(gc_key, entry))
+            if len(full_results) >= size:
+                db.put(full_results)
+                full_results = []
         else:
             raise DataStoreException("Unsupported GC entry type" +
                 type(entry))
 
-    """if len(yg_results) > 0:
-        db.put(yg_results)"""
-    _batch_write(yg_results)
-    _batch_write(full_results)
+    _batch_write(yg_results, size)
+    _batch_write(full_results, size)
+
+
+class MemcacheParseCache(object):
+    """ParseGCLog cache of parse results held in memcache, which bounds 
+    its size by evicting the least recently used values
+
+    Frames are stored in chunks, a frame missing any evicted or unwritten 
+    chunk is treated as a cache miss.
+    """
+    namespace = 'parse_cache'
+
+    def get(self, key):
+        """Cached GCFrame for key, or None"""
+        chunks = memcache.get(key, namespace=self.namespace)
+        if chunks is None:
+            return None
+        chunk_keys = _chunk_keys(key, chunks)
+        values = memcache.get_multi(chunk_keys, namespace=self.namespace)
+        if len(values) != chunks:
+            return None
+        try:
+            return GCFrame.load(StringIO(
+                ''.join(values[chunk_key] for chunk_key in chunk_keys)))
+        except ParseGCException:
+            return None
+
+    def put(self, key, frame):
+        """Cache frame for key, unless it has over MEMCACHE_MAX_CHUNKS 
+        chunks
+
+        Chunks are written MEMCACHE_BATCH_CHUNKS at a time & the number 
+        of chunks, which get reads first, is written last only if every 
+        chunk was written, so a partially written frame is never found.
+        """
+        data = StringIO()
+        frame.dump(data)
+        data = data.getvalue()
+        chunks = -(-len(data) // MEMCACHE_CHUNK_SIZE)
+        if chunks > MEMCACHE_MAX_CHUNKS:
+            return
+        chunk_keys = _chunk_keys(key, chunks)
+        for start in range(0, chunks, MEMCACHE_BATCH_CHUNKS):
+            failed = memcache.set_multi(dict((chunk_keys[i], 
+                data[i * MEMCACHE_CHUNK_SIZE:(i + 1) * MEMCACHE_CHUNK_SIZE])
+                for i in range(start, 
+                    min(start + MEMCACHE_BATCH_CHUNKS, chunks))), 
+                namespace=self.namespace)
+            if failed:
+                return
+        memcache.set(key, chunks, namespace=self.namespace)
+
+
+def _chunk_keys(key, chunks):
+    return ['%s:%d' % (key, i) for i in range(chunks)]
 
 
 def _batch_write(dataset, size=1000):
@@ -67,12 +140,27 @@ def _batch_write(dataset, size=1000):
         db.put(dataset)
 
 
+def _entry_collector(entry):
+    """Collector name of a GCModel, decoded from its code if it has one"""
+    if entry.collector_code is not None:
+        return collector_name(entry.collector_code)
+    return intern_collector(str(entry.collector))
+
+def _model_collector(entry):
+    """GCModel collector properties of an entry, its collector code or, 
+    lacking one, its collector name
+    """
+    code = collector_code(entry.collector)
+    if code is None:
+        return {'collector': entry.collector}
+    return {'collector_code': code}
+
 def _create_yg_entry(entry):
     """Create YoungGenGCEntry from equivalent model object"""
     return YoungGenGCEntry(
         timestamp=float(entry.timestamp),
         gc_timestamp=float(entry.gc_timestamp),
-        collector=entry.collector,
+        collector=_entry_collector(entry),
         yg_util_pre=int(entry.yg_util_pre),
         yg_util_post=int(entry.yg_util_post),
         yg_size_post=int(entry.yg_size_post),
@@ -83,14 +171,15 @@ def _create_yg_entry(entry):
         pause_time=float(entry.pause_time),
         user_time=float(entry.user_time),
         sys_time=float(entry.sys_time),
-        real_time=float(entry.real_time))
+        real_time=float(entry.real_time),
+        wall_time=float(entry.wall_time or 0))
 
 def _create_full_entry(entry):
     """Create FullGCEntry from equivalent model object"""
     return FullGCEntry(
         timestamp=float(entry.timestamp),
         gc_timestamp=float(entry.gc_timestamp),
-        collector=entry.collector,
+        collector=_entry_collector(entry),
         tenured_util_pre=int(entry.tenured_util_pre),
         tenured_util_post=int(entry.tenured_util_post),
         tenured_size_post=int(entry.tenured_size_post),
@@ -105,7 +194,8 @@ def _create_full_entry(entry):
         user_time=float(entry.user_time),
         sys_time=float(entry.sys_time),
         real_time=float(entry.real_time),
-        system=bool(entry.system))
+        system=bool(entry.system),
+        wall_time=float(entry.wall_time or 0))
 
 def _create_yg_model(gc_key, entry):
     """Create YoungGenGCModel from equivalent entry object"""
@@ -113,7 +203,6 @@ def _create_yg_model(gc_key, entry):
         parent=gc_key,
         timestamp=entry.timestamp,
         gc_timestamp=entry.gc_timestamp,
-        collector=entry.collector,
         yg_util_pre=entry.yg_util_pre,
         yg_util_post=entry.yg_util_post,
         yg_size_post=entry.yg_size_post,
@@ -124,7 +213,9 @@ def _create_yg_model(gc_key, entry):
         pause_time=entry.pause_time,
         user_time=entry.user_time,
         sys_time=entry.sys_time,
-        real_time=entry.real_time)
+        real_time=entry.real_time,
+        wall_time=entry.wall_time,
+        **_model_collector(entry))
 
 def _create_full_model(gc_key, entry):
     """Create FullGCModel from equivalent entry object"""
@@ -132,7 +223,6 @@ def _create_full_model(gc_key, entry):
         parent=gc_key,
         timestamp=entry.timestamp,
         gc_timestamp=entry.gc_timestamp,
-        collector=entry.collector,
         tenured_util_pre=entry.tenured_util_pre,
         tenured_util_post=entry.tenured_util_post,
         tenured_size_post=entry.tenured_size_post,
@@ -147,7 +237,9 @@ def _create_full_model(gc_key, entry):
         user_time=entry.user_time,
         sys_time=entry.sys_time,
         real_time=entry.real_time,
-        system=entry.system)
+        system=entry.system,
+        wall_time=entry.wall_time,
+        **_model_collector(entry))
 
 class DataStoreException(Exception):
     pass
\ No newline at end of file
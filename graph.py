@@ -1,7 +1,9 @@
 import abc
+from collections import OrderedDict
 
 from datastore_model import GraphModel
 from parsegc import FullGCEntry, YoungGenGCEntry
+from stats import OVERHEAD_WINDOWS, RateStats, WindowStats
 
 RAW_CSV_DATA = 0
 YG_GC_MEMORY = 1
@@ -9,6 +11,8 @@ GC_DURATION = 2
 MEMORY_RECLAIMED = 3
 FULL_GC_MEMORY = 4
 MEMORY_UTIL_POST = 5
+ALLOCATION_RATE = 6
+GC_OVERHEAD = 7
 
 
 def generate_cached_graph(log_key, graph_type, gc_data, blob_writer):
@@ -27,61 +31,94 @@ def generate_graph(log_key, graph_type, gc_data, blob_writer,
         return "Invalid graph graph_type"
 
 def _raw_csv_data(log_key, gc_data, blob_writer, filename):
-    results = []
-    for entry in gc_data:
-        results.append(GCTSEntry(entry))
+    results = (GCTSEntry(entry) for entry in gc_data)
 
     return blob_writer.generate_csv(results, filename)
 
 def _yg_memory(log_key, gc_data, blob_writer, filename):
 
-    results = []
-    for entry in gc_data:
-        if isinstance(entry, YoungGenGCEntry):
-            results.append(YGMemoryUtil(entry))
+    results = (YGMemoryUtil(entry) for entry in gc_data
+        if isinstance(entry, YoungGenGCEntry))
 
     return blob_writer.generate_csv(results, filename)
 
 def _full_memory(log_key, gc_data, blob_writer, filename):
 
-    results = []
+    results = _full_memory_results(gc_data)
+
+    return blob_writer.generate_csv(results, filename)
+
+def _full_memory_results(gc_data):
+
+    empty = True
     for entry in gc_data:
         if isinstance(entry, FullGCEntry):
-            results.append(FullMemoryUtil(entry))
+            empty = False
+            yield FullMemoryUtil(entry)
 
     # If we don't have any full GC entries
-    if results == []:
-        results.append(FullMemoryUtil(None))
-
-    return blob_writer.generate_csv(results, filename)
+    if empty:
+        yield FullMemoryUtil(None)
 
 def _memory_util_post(log_key, gc_data, blob_writer, filename):
 
-    results = []
-    for entry in gc_data:
-        results.append(MemoryUtilPost(entry))
+    results = (MemoryUtilPost(entry) for entry in gc_data)
 
     return blob_writer.generate_csv(results, filename)
 
 
 def _duration(log_key, gc_data, blob_writer, filename):
 
-    results = []
-    for entry in gc_data:
-        results.append(PauseTime(entry))
+    results = (PauseTime(entry) for entry in gc_data)
 
     return blob_writer.generate_csv(results, filename)
 
 
 def _memory_reclaimed(log_key, gc_data, blob_writer, filename):
 
-    results = []
+    results = (Reclaimed(entry) for entry in gc_data)
+
+    return blob_writer.generate_csv(results, filename)
+
+
+def _allocation_rate(log_key, gc_data, blob_writer, filename):
+
+    results = _allocation_rate_results(gc_data)
+
+    return blob_writer.generate_csv(results, filename)
+
+def _allocation_rate_results(gc_data):
+
+    rates = RateStats()
+    empty = True
     for entry in gc_data:
-        #if isinstance(entry, YoungGenGCEntry):
-        results.append(Reclaimed(entry))
+        if isinstance(entry, YoungGenGCEntry):
+            empty = False
+            yield AllocationRate(entry, rates.process(entry))
+
+    # If we don't have any YG GC entries
+    if empty:
+        yield AllocationRate(None, None)
+
+
+def _gc_overhead(log_key, gc_data, blob_writer, filename):
+
+    results = _gc_overhead_results(gc_data)
 
     return blob_writer.generate_csv(results, filename)
 
+def _gc_overhead_results(gc_data):
+
+    overheads = [WindowStats(window) for window in OVERHEAD_WINDOWS]
+    empty = True
+    for entry in gc_data:
+        empty = False
+        yield GCOverhead(entry, overheads, 
+            [overhead.process(entry) for overhead in overheads])
+
+    if empty:
+        yield GCOverhead(None, overheads, None)
+
 
 _graphs = {
         RAW_CSV_DATA: _raw_csv_data,
@@ -89,7 +126,9 @@ _graphs = {
         FULL_GC_MEMORY: _full_memory,
         GC_DURATION: _duration,
         MEMORY_RECLAIMED: _memory_reclaimed,
-        MEMORY_UTIL_POST: _memory_util_post
+        MEMORY_UTIL_POST: _memory_util_post,
+        ALLOCATION_RATE: _allocation_rate,
+        GC_OVERHEAD: _gc_overhead
     }
 
 
@@ -158,6 +197,46 @@ class Reclaimed(TimeSeriesEntry):
                 gc_entry.perm_util_pre - gc_entry.perm_util_post
 
 
+class AllocationRate(TimeSeriesEntry):
+    """Allocation & promotion rates (bytes/sec) since the previous partial 
+    GC, see stats.RateStats
+    """
+    def __init__(self, gc_entry, rates):
+        self.rate_attr = {
+            'allocation_rate': None,
+            'promotion_rate': None
+        }
+        self.rates = rates
+        super(AllocationRate, self).__init__('timestamp', self.rate_attr, 
+            gc_entry)
+
+    def _get_custom_attr(self, gc_entry):
+        if self.rates:
+            self.rate_attr['allocation_rate'], \
+                self.rate_attr['promotion_rate'] = self.rates
+
+
+class GCOverhead(TimeSeriesEntry):
+    """GC overhead (% of wall time paused) of the sliding windows ending 
+    at the end of each GC, in order of window length, see 
+    stats.WindowStats
+    """
+    def __init__(self, gc_entry, overheads, results):
+        self.overhead_attr = OrderedDict(
+            ('overhead_%gs' % overhead.window, None) 
+            for overhead in overheads)
+        self.overheads = overheads
+        self.results = results
+        super(GCOverhead, self).__init__('timestamp', self.overhead_attr, 
+            gc_entry)
+
+    def _get_custom_attr(self, gc_entry):
+        for overhead, (fraction, collections) in zip(self.overheads, 
+                self.results):
+            self.overhead_attr['overhead_%gs' % overhead.window] = \
+                100 * fraction
+
+
 class YGMemoryUtil(TimeSeriesEntry):
     """Memory utilisation following partial GC"""
     def __init__(self, gc_entry):
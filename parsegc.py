@@ -4,7 +4,44 @@
 #       Add parsing support for Full GC events
 #       Add support for remaining CMS events if applicable
 
+import bisect
+import calendar
+import functools
+import hashlib
+import heapq
+import io
+import itertools
+import mmap
+import operator
+import os
 import re
+import struct
+import time
+import zlib
+
+from array import array
+
+try:
+    import multiprocessing
+except ImportError:
+    # Not available within the App Engine sandbox
+    multiprocessing = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import bz2
+except ImportError:
+    bz2 = None
+
+try:
+    import lzma
+except ImportError:
+    # Python 3.3+ only
+    lzma = None
 
 timestamp = re.compile(r"""
     (\d+\.\d+): (.*)
@@ -20,22 +57,77 @@ Additionally the group matches are all named using symbolic groups,
 (?P<group-name>...) to ensure groups are referenced explicitly via 
 their symbols & not via their numbered groups which can vary. 
 """
-yg_gc_entry = re.compile(r"""
-    \s*\[GC\ (?:(?P<gc_ts>\d+\.\d+):\ )?\[(?P<collector>[A-Za-z]+):
+yg_gc_template = r"""
+    \s*\[GC%(gc_ts)s\[(?P<collector>%(collectors)s):
     \ (?P<yg_pre>\d+)K->(?P<yg_post>\d+)K\((?P<yg_sz>\d+)K\)(?:,\ (?P<yg_pause>\d+\.\d+)\ secs)?\]
     \s*(?P<heap_pre>\d+)K->(?P<heap_post>\d+)K\((?P<heap_sz>\d+)K\),\ (?P<pause>\d+\.\d+)\ secs\]
     \s*\[Times:\ user=(?P<user>\d+\.\d+)\ sys=(?P<sys>\d+\.\d+),?\ real=(?P<real>\d+\.\d+)\ secs\].*
-    """, re.VERBOSE)
+    """
 
-full_gc_entry = re.compile(r"""
-    \s*\[Full\ GC\ (?:\((?P<system>System)\)\ )?(?:(?P<gc_ts>\d+\.\d+):\ )?
-    (?:\[(?P<yg_collector>[A-Za-z]+):\ (?P<yg_pre>\d+)K->(?P<yg_post>\d+)K\((?P<yg_sz>\d+)K\)\]\ )?
-    \[(?P<collector>[A-Za-z]+):
+full_gc_template = r"""
+    \s*\[Full\ GC(?:\ \((?P<system>System)\))?%(gc_ts)s
+    %(young)s\[(?P<collector>%(collectors)s):
     \ (?P<tenured_pre>\d+)K->(?P<tenured_post>\d+)K\((?P<tenured_sz>\d+)K\)(?:,\ (?P<tenured_pause>\d+\.\d+)\ secs)?\]
     \s*(?P<heap_pre>\d+)K->(?P<heap_post>\d+)K\((?P<heap_sz>\d+)K\),?
-    \ \[([A-Za-z]+\ )?[A-Za-z]+\ ?:\ (?P<perm_pre>\d+)K->(?P<perm_post>\d+)K\((?P<perm_sz>\d+)K\)\],\ (?P<perm_pause>\d+\.\d+)\ secs\]
+    \ \[%(perm)s:\ (?P<perm_pre>\d+)K->(?P<perm_post>\d+)K\((?P<perm_sz>\d+)K\)\],\ (?P<perm_pause>\d+\.\d+)\ secs\]
     \s*\[Times:\ user=(?P<user>\d+\.\d+)\ sys=(?P<sys>\d+\.\d+),?\ real=(?P<real>\d+\.\d+)\ secs\].*
-    """, re.VERBOSE)
+    """
+
+# -XX:+PrintGCDateStamps wall clock prefix of timestamps
+DATESTAMP = r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{3}[+-]\d{4}"
+
+"""Entries are logged with (True), without (False) or, if unknown, 
+with or without (None) -XX:+PrintGCDateStamps. With datestamps, GC 
+timestamps within entries are also preceded by a datestamp, which 
+Java 7 logs without a separating space following "[GC", so only 
+profiles known to have datestamps match such entries.
+"""
+DATESTAMP_PREFIXES = {
+    None: r"(?:(?P<datestamp>%s):\ )?" % DATESTAMP, 
+    True: r"(?P<datestamp>%s):\ " % DATESTAMP, 
+    False: r"(?P<datestamp>)",
+}
+
+GC_TIMESTAMPS = {
+    None: r"\ (?:%s:\ )?(?:(?P<gc_ts>\d+\.\d+):\ )?" % DATESTAMP,
+    True: r"\ ?(?:%s:\ )?(?:(?P<gc_ts>\d+\.\d+):\ )?" % DATESTAMP,
+    False: r"\ (?:(?P<gc_ts>\d+\.\d+):\ )?",
+}
+
+ANY_COLLECTOR = r"[A-Za-z]+"
+
+"""Shapes of full GC entries, as the patterns of the young generation 
+preceding the old, the old generation collectors & the perm generation 
+"""
+ANY_OLD = (
+    r"(?:\[[A-Za-z]+:\ \d+K->\d+K\(\d+K\)\]\ )?", 
+    ANY_COLLECTOR, 
+    r"(?:[A-Za-z]+\ )?[A-Za-z]+\ ?")
+PARALLEL_OLD = (
+    r"\[PSYoungGen:\ \d+K->\d+K\(\d+K\)\]\ ", 
+    r"ParOldGen|PSOldGen", 
+    r"PSPermGen")
+CMS_OLD = (r"", r"CMS", r"CMS\ Perm\ ")
+SERIAL_OLD = (r"", r"Tenured", r"Perm\ ")
+
+
+def yg_gc_pattern(collectors=ANY_COLLECTOR, datestamps=None):
+    return re.compile(yg_gc_template % {
+        'gc_ts': GC_TIMESTAMPS[datestamps], 
+        'collectors': collectors}, re.VERBOSE)
+
+
+def full_gc_pattern(old=ANY_OLD, datestamps=None):
+    young, collectors, perm = old
+    return re.compile(full_gc_template % {
+        'gc_ts': GC_TIMESTAMPS[datestamps],
+        'young': young,
+        'collectors': collectors,
+        'perm': perm}, re.VERBOSE)
+
+
+yg_gc_entry = yg_gc_pattern()
+full_gc_entry = full_gc_pattern()
 
 cms_entry = re.compile(r"""
     \s*\[.*CMS.*
@@ -52,99 +144,1318 @@ cms_remark = re.compile(r"""
     """, re.VERBOSE)
 
 
+# Size of the blocks read from a GC log when streaming entries
+BLOCK_SIZE = 1 << 16
+
+# Number of lines per batch of batched field conversion
+BATCH_SIZE = 4096
+
+# Version of the entries produced by the parser, which must be bumped 
+# whenever parsing changes to invalidate cached results
+PARSER_VERSION = 2
+
+# Default bound on the total size of a ParseCache directory
+CACHE_SIZE = 256 << 20
+
+# Number of entries between the offsets recorded by a log index
+INDEX_INTERVAL = 1000
+
+# Size of the span of a log below which bisection switches to scanning
+BISECT_SPAN = 1 << 16
+
+# Lines longer than this are skipped unparsed, as no GC entry comes 
+# close, bounding the cost of matching any line such as the garbage a 
+# crashed JVM can leave in its log
+MAX_LINE_LENGTH = 4096
+
+# Characters absent from GC log text, found in the zero filled & binary 
+# garbage of crashed JVMs' logs, lines containing them are skipped
+GARBAGE = '\x00'
+BYTES_GARBAGE = b'\x00'
+
+"""Dispatch branches for log lines, keyed on the literal prefix of the 
+entry following the timestamp. The prefixes are matched as named 
+alternatives of the timestamp pattern, so lines are only matched 
+against the pattern for their branch, and noise such as CMS phases & 
+application stopped time lines never pay for failed regex matches.
+"""
+YG_GC = 'yg_gc'
+FULL_GC = 'full_gc'
+CMS_INITIAL_MARK = 'cms_initial_mark'
+APP_STOPPED = 'app_stopped'
+UNSUPPORTED = 'unsupported'
+NO_TIMESTAMP = 'no_timestamp'
+# Lines skipped unparsed, as being too long or containing garbage
+SKIPPED = 'skipped'
+
+BRANCHES = (YG_GC, FULL_GC, CMS_INITIAL_MARK, APP_STOPPED, UNSUPPORTED,
+    NO_TIMESTAMP, SKIPPED)
+
+# Number of unmatched lines sampled by ParseDiagnostics, & the length 
+# each is truncated to
+UNMATCHED_SAMPLE = 10
+SAMPLE_LENGTH = 200
+
+
+def dispatch_table(collectors=ANY_COLLECTOR, old=ANY_OLD, cms=True, 
+        datestamps=None):
+    """Dispatch table of (prefix, branch, entry pattern, handler method 
+    name) rows for a log format, the handler generates an entry from the 
+    pattern match, None ignores the entry
+
+    collectors are the young collectors & old the full GC entry shape of 
+    the format, cms whether its logs contain CMS entries.
+    """
+    table = []
+    if cms:
+        table.append(
+            ("[GC [1 CMS-initial-mark", CMS_INITIAL_MARK, None, None))
+    table += [
+        ("[GC" if datestamps else "[GC ", YG_GC, 
+            yg_gc_pattern(collectors, datestamps), '_parse_yg_gc'),
+        ("[Full GC", FULL_GC, full_gc_pattern(old, datestamps), 
+            '_parse_full_gc'),
+        ("Total time", APP_STOPPED, None, None),
+    ]
+    return table
+
+
+def compile_dispatch(table, datestamps=None):
+    """Compile a timestamp pattern capturing each dispatch table prefix 
+    as a group named after its branch, the lastgroup of a match is then 
+    the branch of the line ('timestamp' if no prefix matched)
+    """
+    # Longest prefixes first, as "[GC " is a prefix of "[GC [1 CMS..."
+    rows = sorted(table, key=lambda row: -len(row[0]))
+    return re.compile(r"%s(?P<timestamp>\d+\.\d+):\s*(?:%s)?.*" % (
+        DATESTAMP_PREFIXES[datestamps], "|".join(
+            "(?P<%s>%s)" % (branch, re.escape(prefix)) 
+            for prefix, branch, pattern, handler in rows)))
+
+
+"""Log format profiles, each parsing its format with the minimal set of 
+entry patterns able to match it. A profile is sniffed from the first 
+SNIFF_LINES lines of each log, falling back to the default profile, 
+which parses any supported format, if the format is inconclusive. 
+New formats can be added as profiles without slowing down others.
+"""
+DEFAULT = 'default'
+PARALLEL = 'parallel'
+CMS = 'cms'
+SERIAL = 'serial'
+# Logs without -XX:+PrintGCDetails, which have no supported entries
+NO_DETAILS = 'no_details'
+
+# Format: (young collectors, full GC entry shape, contains CMS entries)
+FORMATS = {
+    DEFAULT: (ANY_COLLECTOR, ANY_OLD, True),
+    PARALLEL: (r"PSYoungGen", PARALLEL_OLD, False),
+    CMS: (r"ParNew|DefNew", CMS_OLD, True),
+    SERIAL: (r"DefNew|ParNew", SERIAL_OLD, False),
+}
+
+# Substrings of entries which identify the format of a log
+FORMAT_MARKERS = (
+    ("[PSYoungGen", PARALLEL), 
+    ("[CMS", CMS), 
+    ("CMS-initial-mark", CMS), 
+    ("[Tenured", SERIAL),
+)
+
+no_details_entry = re.compile(r"""
+    \[(?:Full\ )?GC\ (?:\(System\)\ )?\d+K->
+    """, re.VERBOSE)
+
+SNIFF_LINES = 200
+
+
+class LogProfile(object):
+    """GC log format & the compiled dispatch of its dispatch table"""
+    def __init__(self, name, datestamps=None):
+        self.name = name
+        self.datestamps = datestamps
+        if name == NO_DETAILS:
+            self.table = [("Total time", APP_STOPPED, None, None)]
+        else:
+            collectors, old, cms = FORMATS[name]
+            self.table = dispatch_table(collectors, old, cms, datestamps)
+        self.dispatch = compile_dispatch(self.table, datestamps)
+        self.bytes_dispatch = to_bytes_pattern(self.dispatch)
+
+    @property
+    def key(self):
+        return self.name, self.datestamps
+
+    def __repr__(self):
+        return "LogProfile(%r, datestamps=%r)" % self.key
+
+
+_profiles = {}
+
+
+def get_profile(name, datestamps=None):
+    """LogProfile of the named format, compiled once"""
+    profile = _profiles.get((name, datestamps))
+    if profile is None:
+        profile = _profiles[name, datestamps] = LogProfile(name, datestamps)
+    return profile
+
+
+def sniff_profile(lines):
+    """LogProfile of a log beginning with lines, the default format if 
+    its format is inconclusive
+    """
+    formats = set()
+    datestamps = set()
+    dispatch = DEFAULT_PROFILE.dispatch
+    for line in lines:
+        ts = dispatch.match(line)
+        if not ts:
+            # Such as JVM version & command line flags headers
+            continue
+        datestamps.add(bool(ts.group('datestamp')))
+        for marker, name in FORMAT_MARKERS:
+            if marker in line:
+                formats.add(name)
+        if no_details_entry.search(line, ts.end('timestamp')):
+            formats.add(NO_DETAILS)
+
+    datestamps = datestamps.pop() if len(datestamps) == 1 else None
+    if len(formats) != 1:
+        return get_profile(DEFAULT, datestamps)
+    return get_profile(formats.pop(), datestamps)
+
+
+def to_bytes_pattern(pattern):
+    """Compile the bytes equivalent of a text pattern, for matching 
+    directly over a bytes like object such as an mmap
+    """
+    source = pattern.pattern
+    if not isinstance(source, bytes):
+        source = source.encode('ascii')
+    return re.compile(source, pattern.flags & ~re.UNICODE)
+
+
+def _text(value):
+    """Decode a captured bytes group value to str (a no-op in Python 2)"""
+    if isinstance(value, str):
+        return value
+    return value.decode('ascii')
+
+
+"""Code table of collector names, the codes of which are persisted in 
+place of the names, so names may only be appended. Collectors missing 
+from the table are persisted by name.
+"""
+COLLECTORS = ('ParNew', 'DefNew', 'PSYoungGen', 'CMS', 'Tenured', 
+    'ParOldGen', 'PSOldGen', 'ASParNew', 'ASCMS')
+COLLECTOR_CODES = dict((name, code) for code, name in enumerate(COLLECTORS))
+
+# Bound on the distinct collector names interned, beyond which names 
+# (of a corrupt log) are no longer shared
+MAX_COLLECTOR_NAMES = 256
+
+# Shared str of each captured collector name value, str or bytes
+_collector_names = dict((name, name) for name in COLLECTORS)
+
+
+def intern_collector(value):
+    """Shared str of the captured collector name value, so that the 
+    entries of a collector all reference one name rather than a copy each
+    """
+    name = _collector_names.get(value)
+    if name is None:
+        name = _text(value)
+        if len(_collector_names) < MAX_COLLECTOR_NAMES:
+            name = _collector_names.setdefault(value, 
+                _collector_names.get(name, name))
+    return name
+
+
+def collector_code(name):
+    """Code of the collector name in COLLECTORS, or None"""
+    return COLLECTOR_CODES.get(name)
+
+
+def collector_name(code):
+    """Collector name of a COLLECTORS code"""
+    return COLLECTORS[code]
+
+
+DEFAULT_PROFILE = get_profile(DEFAULT)
+DISPATCH_TABLE = DEFAULT_PROFILE.table
+
+
 # TODO Remove ParseGCLog class wrapper around these functions?
 class ParseGCLog(object):        
 
-    def parse_file(self, file):
-        gclog = open(file, "r")
-        return self.parse_data(gclog)
+    def __init__(self, cache=None, profile=None, lazy=False, 
+            tokenizer=False):
+        # ParseDiagnostics of everything parsed
+        self.diagnostics = ParseDiagnostics()
+        # Parse results cache, such as ParseCache, checked by parse_data
+        self.cache = cache
+        # LogProfile of parsed logs, None to sniff the profile of each log
+        self.profile = profile
+        # LogProfile of the most recently parsed log
+        self.log_profile = profile or DEFAULT_PROFILE
+        # Whether entries parsed from text are LazyYoungGenGCEntry & 
+        # LazyFullGCEntry, decoding their fields on first access
+        self.lazy = lazy
+        # Whether young & full GC entries of text are found by the 
+        # TOKENIZERS rather than by matching their patterns
+        self.tokenizer = tokenizer
+        self._decode_datestamp = DatestampDecoder()
+        self._compile_profiles()
+
+    def __getstate__(self):
+        # Bound handler methods can't be pickled, they are rebuilt on load
+        state = self.__dict__.copy()
+        for name in ('_compiled', '_dispatch', '_handlers', 
+                '_bytes_dispatch', '_bytes_handlers'):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compile_profiles()
+
+    @property
+    def dispatch_counts(self):
+        """Number of lines parsed down each dispatch branch"""
+        return self.diagnostics.dispatch_counts
+
+    def _compile_profiles(self):
+        # Profile used to parse individual lines
+        self._compiled = {}
+        (self._dispatch, self._handlers, self._bytes_dispatch, 
+            self._bytes_handlers) = self._compile(
+                self.profile or DEFAULT_PROFILE)
+
+    def _compile(self, profile):
+        """(dispatch, handlers, bytes dispatch, bytes handlers) of profile,
+        with the handlers bound to this parser
+        """
+        compiled = self._compiled.get(profile.key)
+        if compiled is None:
+            handlers, bytes_handlers = self._build_handlers(profile.table, 
+                profile.datestamps)
+            compiled = self._compiled[profile.key] = (profile.dispatch, 
+                handlers, profile.bytes_dispatch, bytes_handlers)
+        return compiled
+
+    def _build_handlers(self, table, datestamps=None):
+        """Map each branch to the match method of its entry pattern & its 
+        bound handler method, for both text & bytes patterns
+        """
+        handlers = {UNSUPPORTED: None}
+        bytes_handlers = {UNSUPPORTED: None}
+        for prefix, branch, pattern, handler in table:
+            if handler:
+                match, text_handler = pattern.match, handler
+                if self.tokenizer and branch in TOKENIZERS:
+                    tokenizer, text_handler = TOKENIZERS[branch]
+                    match = functools.partial(tokenizer, 
+                        datestamps=datestamps)
+                # Lazy entries decode their fields through the group 
+                # method of either a match or Tokens
+                if self.lazy:
+                    text_handler = handler + '_lazy'
+                # Matches over buffers such as an mmap can't outlive the 
+                # buffer, so entries parsed from bytes are never lazy
+                handlers[branch] = (match, getattr(self, text_handler))
+                bytes_handlers[branch] = (
+                    to_bytes_pattern(pattern).match, getattr(self, handler))
+            else:
+                handlers[branch] = None
+                bytes_handlers[branch] = None
+        # Branches of other profiles' tables are unsupported by this one
+        for branch in (YG_GC, FULL_GC, CMS_INITIAL_MARK, APP_STOPPED):
+            handlers.setdefault(branch, None)
+            bytes_handlers.setdefault(branch, None)
+        return handlers, bytes_handlers
+
+    def _sniff(self, lines):
+        """Compiled profile of the log of the lines iterator, sniffed from 
+        its first SNIFF_LINES lines unless the parser has a profile, & an 
+        iterator of all of its lines
+        """
+        if self.profile is not None:
+            return self._compile(self.profile), lines
+        start = time.time()
+        head = list(itertools.islice(lines, SNIFF_LINES))
+        self.log_profile = sniff_profile(head)
+        self.diagnostics.add_time('sniff', time.time() - start)
+        return self._compile(self.log_profile), itertools.chain(head, lines)
+
+    def parse_file(self, file, columnar=False, index=False, start=None, 
+            end=None):
+        """Parse the named file, returning a list or, if columnar, 
+        a GCFrame
+
+        If index, a sparse index of the file is written alongside it for 
+        parse_range (unless compressed, as compressed files can't be 
+        seeked into). If start and/or end are given, only entries with 
+        timestamps between them (inclusive) are parsed, see parse_range.
+        """
+        if start is not None or end is not None:
+            return self._parse_window(file, start, end, columnar)
+        if index and not is_compressed(file):
+            return self._parse_file_indexed(file, columnar)
+        with open(file, "rb") as gclog:
+            return self.parse_data(gclog, columnar)
+
+    def _parse_file_indexed(self, file, columnar):
+        size = os.path.getsize(file)
+        entries = []
+        index = []
+        for offset, entry in self.iter_parse_mmap(file, offsets=True):
+            if len(entries) % INDEX_INTERVAL == 0:
+                index.append((offset, entry.timestamp))
+            entries.append(entry)
+        write_index(file, index, size)
+        return GCFrame.from_entries(entries) if columnar else entries
+
+    def parse_range(self, file, t_start, t_end, columnar=False):
+        """Parse the entries of the named file with timestamps between 
+        t_start & t_end inclusive
+
+        The index of file, written by parse_file(file, index=True) on 
+        first use, is binary searched for the byte range covering the 
+        window, so only that range of the file is parsed. Timestamps are 
+        assumed to increase through the file, as JVM uptime does.
+        """
+        if is_compressed(file) or read_index(file) is not None:
+            return self._parse_window(file, t_start, t_end, columnar)
+        entries = [entry for entry in self.parse_file(file, index=True)
+            if t_start <= entry.timestamp <= t_end]
+        return GCFrame.from_entries(entries) if columnar else entries
+
+    def _parse_window(self, file, start, end, columnar):
+        """Parse the entries of file with timestamps from start to end, 
+        located via the index of file if it has one, otherwise by 
+        bisecting the file itself
+        """
+        t_start = float('-inf') if start is None else start
+        t_end = float('inf') if end is None else end
+        if is_compressed(file):
+            entries = self.iter_parse_file(file)
+        else:
+            index = read_index(file)
+            if index is None:
+                entries = self._iter_bisect(file, t_start, t_end)
+            else:
+                entries = self._iter_range(file, index, t_start, t_end)
+        entries = [entry for entry in entries 
+            if t_start <= entry.timestamp <= t_end]
+        return GCFrame.from_entries(entries) if columnar else entries
+
+    def _iter_bisect(self, file, t_start, t_end):
+        """Entries of file from the line located by bisect_offset for 
+        t_start, stopping at the first entry after t_end
+        """
+        pos = 0
+        if t_start > float('-inf'):
+            with open(file, "rb") as gclog:
+                if os.fstat(gclog.fileno()).st_size == 0:
+                    return
+                buf = mmap.mmap(gclog.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    pos = bisect_offset(buf, t_start)
+                finally:
+                    buf.close()
+        for entry in self.iter_parse_mmap(file, pos):
+            if entry.timestamp > t_end:
+                break
+            yield entry
+
+    def _iter_range(self, file, index, t_start, t_end):
+        """Entries of file between the indexed offsets bounding the window
+        t_start to t_end, stopping at the first entry after t_end
+        """
+        offsets, timestamps = index
+        # Entries preceding an indexed entry are no later than it
+        before = bisect.bisect_left(timestamps, t_start) - 1
+        after = bisect.bisect_right(timestamps, t_end)
+        pos = offsets[before] if before >= 0 else 0
+        endpos = offsets[after] if after < len(offsets) else None
+        for entry in self.iter_parse_mmap(file, pos, endpos):
+            if entry.timestamp > t_end:
+                break
+            yield entry
             
-    def parse_data(self, data):
-        gcdata = []
-        gclog = data.readlines()
-        for line in gclog:
-            result = self.parse(line)
+    def parse_data(self, data, columnar=False):
+        """Parse entries from data, returning a list or, if columnar, 
+        a GCFrame
+
+        gzip, bzip2 & xz compressed data is decompressed as it is parsed.
+        If the parser has a cache, results of previously parsed content 
+        are loaded from it instead (counting only the cache stage time 
+        in diagnostics).
+        """
+        if self.cache is not None:
+            return self._parse_cached(data, columnar)
+        return self._parse_data(data, columnar)
+
+    def _parse_cached(self, data, columnar):
+        """parse_data via the cache, keyed on the content of data & the 
+        forced profile, which is parsed uncached if it can't be rewound 
+        after hashing
+        """
+        start = time.time()
+        try:
+            pos = data.tell()
+            key = content_key(data, self.profile)
+            data.seek(pos)
+        except (AttributeError, IOError):
+            return self._parse_data(data, columnar)
+
+        frame = self.cache.get(key)
+        self.diagnostics.add_time('cache', time.time() - start)
+        if frame is not None:
+            return frame if columnar else list(frame)
+
+        results = self._parse_data(data, columnar)
+        start = time.time()
+        self.cache.put(key, 
+            results if columnar else GCFrame.from_entries(results))
+        self.diagnostics.add_time('cache', time.time() - start)
+        return results
+
+    def _parse_data(self, data, columnar):
+        start = time.time()
+        if columnar:
+            results = GCFrame()
+            for kinds, columns in self.iter_batches(data):
+                results.extend_batch(kinds, columns)
+        else:
+            results = list(self.iter_parse(data))
+        self.diagnostics.add_time('parse', time.time() - start)
+        return results
+
+    def parse_file_mmap(self, file, columnar=False):
+        """Parse file via iter_parse_mmap, returning the same entries as 
+        parse_file
+
+        This is not faster than parse_file, see iter_parse_mmap, which 
+        remains the default path.
+        """
+        start = time.time()
+        if columnar:
+            results = GCFrame.from_entries(self.iter_parse_mmap(file))
+        else:
+            results = list(self.iter_parse_mmap(file))
+        self.diagnostics.add_time('parse', time.time() - start)
+        return results
+
+    def iter_parse_mmap(self, file, pos=0, endpos=None, offsets=False):
+        """Generator yielding GC entries parsed from a memory mapping of 
+        file, avoiding reading & copying each line of the file
+
+        This is for parsing byte ranges of file in place, such as those 
+        found by bisect_offset or the index, & yielding the offset of each 
+        entry, rather than for speed. Matching bytes patterns over the 
+        mapping is no faster than streaming text by iter_parse_file (it is 
+        slower on small logs), & the mapped pages of the file count 
+        towards peak RSS, so it is not the default path.
+
+        Compressed files can't be parsed in place, so are streamed by 
+        iter_parse_file instead (ignoring pos, endpos & offsets).
+        """
+        if is_compressed(file):
+            for result in self.iter_parse_file(file):
+                yield result
+            return
+
+        with open(file, "rb") as gclog:
+            if os.fstat(gclog.fileno()).st_size == 0:
+                return
+            buf = mmap.mmap(gclog.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                for result in self.iter_parse_buffer(buf, pos, endpos, 
+                        offsets):
+                    yield result
+            finally:
+                buf.close()
+
+    def iter_parse_buffer(self, buf, pos=0, endpos=None, offsets=False):
+        """Generator yielding GC entries parsed from the lines of buf, a 
+        bytes like object such as an mmap, between pos & endpos
+
+        Lines are matched in place with bytes patterns, so only the 
+        captured groups of each entry are copied out of buf. If offsets, 
+        (offset of line, entry) tuples are yielded.
+        """
+        if endpos is None:
+            endpos = len(buf)
+        find = buf.find
+        dispatch, handlers = self._sniff_buffer(buf, pos, endpos)
+        while pos < endpos:
+            eol = find(b'\n', pos, endpos)
+            if eol < 0:
+                eol = endpos
+            result = self._parse_span(buf, pos, eol, dispatch, handlers)
             if result:
-                gcdata.append(result)
-        return gcdata
+                yield (pos, result) if offsets else result
+            pos = eol + 1
+
+    def _sniff_buffer(self, buf, pos, endpos):
+        """Bytes dispatch & handlers of the profile of the log in buf"""
+        if self.profile is None:
+            end = pos
+            for count in range(SNIFF_LINES):
+                end = buf.find(b'\n', end, endpos) + 1
+                if not end:
+                    end = endpos
+                    break
+            self.log_profile = sniff_profile(
+                _text_block(buf[pos:end]).split('\n'))
+        compiled = self._compile(self.log_profile if self.profile is None 
+            else self.profile)
+        return compiled[2], compiled[3]
+
+    def iter_merge(self, logs, key='timestamp'):
+        """Generator yielding (source, entry) for the entries of several 
+        logs, merged in order of the entry attribute key
+
+        logs is a list of files (names or file like objects), each its 
+        own source, or a dict mapping each source, such as a JVM, to its 
+        list of files, such as the 
+        gc.log.0 ... gc.log.N of -XX:+UseGCLogFileRotation. Every file 
+        is parsed lazily & merged by a heap of the next entry of each, 
+        so memory is bounded by the number of files rather than their 
+        size. Rotated files needn't be in order, & entries duplicated in 
+        the overlapping files of a source are yielded once. As JVM uptime 
+        timestamps of different JVMs aren't comparable, sources may be 
+        merged by 'wall_time' if they are date stamped.
+        """
+        if isinstance(logs, dict):
+            logs = sorted(logs.items())
+        else:
+            logs = [(file, [file]) for file in logs]
+        streams = []
+        for source, files in logs:
+            for file in files:
+                if hasattr(file, 'read'):
+                    entries = self.iter_parse(file)
+                else:
+                    entries = self.iter_parse_file(file)
+                streams.append(_keyed_entries(entries, key, len(streams), 
+                    source))
+
+        # Entries of each source yielded at its latest key value
+        latest = {}
+        for value, stream, seq, source, entry in heapq.merge(*streams):
+            recent = latest.get(source)
+            if recent is not None and recent[0] == value:
+                if entry in recent[1]:
+                    continue
+                recent[1].append(entry)
+            else:
+                latest[source] = (value, [entry])
+            yield source, entry
+
+    def follow(self, file, checkpoint=None):
+        """GCLogFollower incrementally parsing file as it is written"""
+        return GCLogFollower(self, file, checkpoint)
+
+    def iter_parse_file(self, file, block_size=BLOCK_SIZE):
+        """Generator yielding GC entries parsed from the named file"""
+        with open(file, "rb") as gclog:
+            for result in self.iter_parse(gclog, block_size):
+                yield result
+
+    def parse_file_parallel(self, file, workers=None, chunks=None, 
+            columnar=False):
+        """Parse file using a pool of worker processes, returning a list 
+        or, if columnar, a GCFrame
+
+        The file is split into chunks at line boundaries which are parsed 
+        concurrently. As GC log entries are written in timestamp order, 
+        concatenating the chunk results in file order merges them, 
+        returning the same results as parse_file.
+
+        workers defaults to the number of CPUs, chunks to 4 per worker 
+        so that uneven chunks are balanced across the pool. Compressed 
+        files are parsed serially.
+        """
+        if multiprocessing is None:
+            raise ParseGCException("multiprocessing is not available")
+        if is_compressed(file):
+            # Compressed streams can't be split, so are parsed serially
+            return self.parse_file(file, columnar)
+
+        workers = workers or multiprocessing.cpu_count()
+        offsets = split_file(file, chunks or workers * 4)
+        tasks = [(self, file, start, end) 
+            for start, end in zip(offsets, offsets[1:])]
+
+        pool = multiprocessing.Pool(workers)
+        try:
+            chunk_results = pool.map(_parse_chunk, tasks, 1)
+        finally:
+            pool.close()
+            pool.join()
+
+        results = GCFrame()
+        for dumped, diagnostics in chunk_results:
+            results.extend_frame(GCFrame.load(io.BytesIO(dumped)))
+            self.diagnostics.merge(diagnostics)
+        return results if columnar else list(results)
+
+    def iter_parse_batched(self, fileobj, batch_size=BATCH_SIZE, 
+                block_size=BLOCK_SIZE):
+        """Generator yielding the same GC entries as iter_parse
+
+        Rather than converting the fields of each entry as it is parsed, 
+        the captured fields of batch_size lines are collected & each 
+        field converted a column at a time by convert_column.
+        """
+        for kinds, columns in self.iter_batches(fileobj, batch_size, 
+                block_size):
+            entries = [itertools.starmap(ENTRY_TYPES[kind], 
+                zip(*columns[kind])) for kind in KINDS]
+            for kind in kinds:
+                yield next(entries[kind])
+
+    def iter_batches(self, fileobj, batch_size=BATCH_SIZE, 
+                block_size=BLOCK_SIZE):
+        """Generator yielding converted field columns for each batch of 
+        batch_size lines parsed from fileobj
+
+        Each batch is a tuple (kinds, columns), kinds being the kind of 
+        each entry in log order & columns[kind] the list of converted 
+        columns for entries of that kind, in entry type _fields order 
+        followed by the wall_time column.
+        """
+        (dispatch, handlers, bytes_dispatch, bytes_handlers), lines = \
+            self._sniff(iter_lines(open_log(fileobj), block_size))
+
+        def convert(raw):
+            start = time.time()
+            columns = _convert_batch(raw)
+            self.diagnostics.add_time('convert', time.time() - start)
+            return columns
+
+        kinds = []
+        raw = [[] for kind in KINDS]
+        for count, line in enumerate(lines, 1):
+            matched = self._match_span(line, 0, len(line), dispatch,
+                handlers)
+            if matched:
+                branch, ts, datestamp, entry = matched
+                kind = BRANCH_KINDS[branch]
+                kinds.append(kind)
+                raw[kind].append(
+                    (ts,) + entry.group(*GROUPS[kind]) + (datestamp,))
+            if count % batch_size == 0 and kinds:
+                yield kinds, convert(raw)
+                kinds = []
+                raw = [[] for kind in KINDS]
+        if kinds:
+            yield kinds, convert(raw)
+
+    def iter_parse(self, fileobj, block_size=BLOCK_SIZE):
+        """Generator yielding GC entries as they are parsed from fileobj
+
+        The log is read in blocks of block_size bytes, so memory use is 
+        bounded by the block size rather than the size of the log. 
+        Compressed logs are decompressed as they are read.
+        """
+        (dispatch, handlers, bytes_dispatch, bytes_handlers), lines = \
+            self._sniff(iter_lines(open_log(fileobj), block_size))
+        parse_span = self._parse_span
+        for line in lines:
+            result = parse_span(line, 0, len(line), dispatch, handlers)
+            if result:
+                yield result
 
     def parse(self, line):
-        ts = timestamp.match(line)
-        if ts:
-            #print "timestamp: " + ts.group(1)
-            #print "remaining: " + ts.group(ts.lastindex)
-            entry = ts.group(ts.lastindex)
-            yg_gc = yg_gc_entry.match(entry)
-            if yg_gc:
-                #print "gc timestamp: " + gc.group(1)
-                #print "younggen util pre: " + gc.group(2)
-                #print "younggen util post: " + gc.group(3)
-                #print "younggen size post: " + gc.group(4)
-                #print "younggen duration:" + gc.group(5)
-                #print "heap util pre: " + gc.group(6)
-                #print "heap util post: " + gc.group(7)
-                #print "heap size post: " + gc.group(8)
-                #print "gc duration: " + gc.group(9)
-                #print "user: " + gc.group(10)
-                #print "sys: " + gc.group(11)
-                #print "real: " + gc.group(12)
-                #print gc.groups()
-
-                #result = YoungGenGCEntry(ts.group(1), *yg_gc.groups())
-                result = generate_yg_gc_entry(ts.group(1),
-                    yg_gc.group('gc_ts'),
-                    yg_gc.group('collector'),
-                    yg_gc.group('yg_pre'),
-                    yg_gc.group('yg_post'),
-                    yg_gc.group('yg_sz'),
-                    yg_gc.group('yg_pause'),
-                    yg_gc.group('heap_pre'),
-                    yg_gc.group('heap_post'),
-                    yg_gc.group('heap_sz'),
-                    yg_gc.group('pause'),
-                    yg_gc.group('user'),
-                    yg_gc.group('sys'),
-                    yg_gc.group('real'))
-
-                return result
-
-            full_gc = full_gc_entry.match(entry)
-            if full_gc:
-                result = generate_full_gc_entry(ts.group(1),
-                    full_gc.group('gc_ts'),
-                    full_gc.group('collector'),
-                    full_gc.group('tenured_pre'),
-                    full_gc.group('tenured_post'),
-                    full_gc.group('tenured_sz'),
-                    full_gc.group('tenured_pause'),
-                    full_gc.group('heap_pre'),
-                    full_gc.group('heap_post'),
-                    full_gc.group('heap_sz'),
-                    full_gc.group('perm_pre'),
-                    full_gc.group('perm_post'),
-                    full_gc.group('perm_sz'),
-                    full_gc.group('perm_pause'),
-                    full_gc.group('user'),
-                    full_gc.group('sys'),
-                    full_gc.group('real'),
-                    full_gc.group('system'))
-
-                return result
-
-            """cms = cms_entry.match(entry)
-            if cms:
-                initial_mark = cms_initial_mark.match(entry)
-                if initial_mark:
-                    #
-                remark = cms_remark.match(entry)
-                if remark:
-                    #
-            else:    
-                #print "Ignoring unsupported GC entry: " + entry
-                return None"""
+        return self._parse_span(line, 0, len(line), self._dispatch, 
+            self._handlers)
+
+    def _parse_span(self, line, pos, endpos, dispatch, handlers):
+        """Parse the entry of line between pos & endpos"""
+        matched = self._match_span(line, pos, endpos, dispatch, handlers)
+        if matched:
+            branch, ts, datestamp, entry = matched
+            return handlers[branch][1](ts, entry, 
+                self._decode_datestamp(datestamp) if datestamp else 0.0)
+        return None
+
+    def _match_span(self, line, pos, endpos, dispatch, handlers):
+        """Match the entry of line between pos & endpos, returning its 
+        branch, timestamp, datestamp ('' or None if not date stamped) & 
+        entry pattern match, or None if the line has no handler or does 
+        not match its entry pattern
+
+        Lines longer than MAX_LINE_LENGTH or containing GARBAGE are 
+        skipped before any pattern is matched, so no line costs more 
+        than a scan for garbage & the matching of MAX_LINE_LENGTH 
+        characters.
+        """
+        diagnostics = self.diagnostics
+        diagnostics.bytes_scanned += endpos - pos
+        if endpos - pos > MAX_LINE_LENGTH or line.find(
+                GARBAGE if isinstance(line, str) else BYTES_GARBAGE, 
+                pos, endpos) >= 0:
+            diagnostics.dispatch_counts[SKIPPED] += 1
+            return None
+
+        ts = dispatch.match(line, pos, endpos)
+        if not ts:
+            diagnostics.dispatch_counts[NO_TIMESTAMP] += 1
+            diagnostics.add_unmatched(line, pos, endpos)
+            return None
+
+        branch = ts.lastgroup
+        if branch == 'timestamp':
+            # TODO: Add support for remaining CMS entries
+            branch = UNSUPPORTED
+        diagnostics.dispatch_counts[branch] += 1
+
+        handler = handlers[branch]
+        if handler:
+            # Match the entry in place, rather than copying it from line
+            entry = handler[0](line, ts.start(branch), ts.end())
+            if entry:
+                return (branch,) + ts.group('timestamp', 'datestamp') + (
+                    entry,)
+            diagnostics.add_unmatched(line, pos, endpos)
+        return None
+
+    def _parse_yg_gc(self, ts, yg_gc, wall_time=0.0):
+        return generate_yg_gc_entry(ts,
+            yg_gc.group('gc_ts'),
+            yg_gc.group('collector'),
+            yg_gc.group('yg_pre'),
+            yg_gc.group('yg_post'),
+            yg_gc.group('yg_sz'),
+            yg_gc.group('yg_pause'),
+            yg_gc.group('heap_pre'),
+            yg_gc.group('heap_post'),
+            yg_gc.group('heap_sz'),
+            yg_gc.group('pause'),
+            yg_gc.group('user'),
+            yg_gc.group('sys'),
+            yg_gc.group('real'),
+            wall_time)
+
+    def _parse_yg_gc_tokens(self, ts, tokens, wall_time=0.0):
+        return generate_yg_gc_entry(ts, *tokens, wall_time=wall_time)
+
+    def _parse_full_gc_tokens(self, ts, tokens, wall_time=0.0):
+        return generate_full_gc_entry(ts, *tokens, wall_time=wall_time)
+
+    def _parse_yg_gc_lazy(self, ts, yg_gc, wall_time=0.0):
+        return LazyYoungGenGCEntry(float(ts), yg_gc, wall_time)
+
+    def _parse_full_gc_lazy(self, ts, full_gc, wall_time=0.0):
+        return LazyFullGCEntry(float(ts), full_gc, wall_time)
+
+    def _parse_full_gc(self, ts, full_gc, wall_time=0.0):
+        return generate_full_gc_entry(ts,
+            full_gc.group('gc_ts'),
+            full_gc.group('collector'),
+            full_gc.group('tenured_pre'),
+            full_gc.group('tenured_post'),
+            full_gc.group('tenured_sz'),
+            full_gc.group('tenured_pause'),
+            full_gc.group('heap_pre'),
+            full_gc.group('heap_post'),
+            full_gc.group('heap_sz'),
+            full_gc.group('perm_pre'),
+            full_gc.group('perm_post'),
+            full_gc.group('perm_sz'),
+            full_gc.group('perm_pause'),
+            full_gc.group('user'),
+            full_gc.group('sys'),
+            full_gc.group('real'),
+            full_gc.group('system'),
+            wall_time)
+
+
+def _convert_batch(raw):
+    """Convert the raw captured field tuples of each kind to columns"""
+    columns = []
+    for kind, rows in enumerate(raw):
+        if rows:
+            columns.append([convert_column(values, conversion) 
+                for values, conversion in zip(zip(*rows), CONVERSIONS[kind])])
+        else:
+            columns.append([])
+    return columns
+
+
+def convert_column(values, conversion):
+    """Convert a column of captured string field values in one operation
+
+    Integer columns are parsed by NumPy from a single joined string where 
+    available, float columns by the builtin float mapped over the column,
+    which is faster than NumPy's string to float conversion.
+    """
+    if conversion == TEXT:
+        return [intern_collector(value) for value in values]
+    if conversion == FLAG:
+        return [value is not None for value in values]
+    if conversion == WALL_TIME:
+        decode = DatestampDecoder()
+        return [decode(value) for value in values]
+    if conversion == OPTIONAL_FLOAT:
+        values = [value or '0' for value in values]
+    if conversion != KB:
+        return list(map(float, values))
+    if numpy is not None:
+        column = numpy.fromstring(' '.join(values), dtype=numpy.int64, 
+            sep=' ')
+        return (column << 10).tolist()
+    return [int(value) << 10 for value in values]
+
+
+class DatestampDecoder(object):
+    """Decodes -XX:+PrintGCDateStamps datestamps, such as 
+    2014-07-17T12:55:36.155+0200, to seconds since the epoch
+
+    Successive entries are logged within the same hour, so the date, hour 
+    & UTC offset are decoded once per hour & cached, leaving only the 
+    minutes, seconds & millis to be parsed for each entry. Missing 
+    datestamps decode to 0.0.
+    """
+    def __init__(self):
+        self._hour = None
+        self._hour_time = None
+
+    def __call__(self, datestamp):
+        if not datestamp:
+            return 0.0
+        datestamp = _text(datestamp)
+        hour = datestamp[:13] + datestamp[23:]
+        if hour != self._hour:
+            self._hour_time = _decode_hour(datestamp)
+            self._hour = hour
+        return (self._hour_time + int(datestamp[14:16]) * 60 + 
+            int(datestamp[17:19]) + int(datestamp[20:23]) / 1000.0)
+
+
+def _decode_hour(datestamp):
+    """Seconds since the epoch of the start of the hour of datestamp"""
+    offset = int(datestamp[24:26]) * 3600 + int(datestamp[26:28]) * 60
+    if datestamp[23] == '-':
+        offset = -offset
+    return calendar.timegm((int(datestamp[0:4]), int(datestamp[5:7]), 
+        int(datestamp[8:10]), int(datestamp[11:13]), 0, 0)) - offset
+
+
+class ParseDiagnostics(object):
+    """What a ParseGCLog has parsed, counted cheaply enough to always be 
+    kept
+
+    dispatch_counts is the number of lines parsed down each dispatch 
+    branch, unmatched the number of lines not understood, having no 
+    timestamp or not matching the entry pattern of their branch, of 
+    which the first UNMATCHED_SAMPLE (truncated to SAMPLE_LENGTH) are 
+    kept in unmatched_lines. bytes_scanned is the total length of the 
+    lines parsed & stage_times the elapsed secs of each stage of parsing, 
+    'sniff', 'parse' (including sniff & convert), 'convert' (of batched 
+    conversion) & 'cache' (content hashing & cache lookups).
+    """
+    def __init__(self):
+        self.dispatch_counts = dict.fromkeys(BRANCHES, 0)
+        self.unmatched = 0
+        self.unmatched_lines = []
+        self.bytes_scanned = 0
+        self.stage_times = {}
+
+    def add_unmatched(self, line, pos, endpos):
+        self.unmatched += 1
+        if len(self.unmatched_lines) < UNMATCHED_SAMPLE:
+            sample = line[pos:min(endpos, pos + SAMPLE_LENGTH)]
+            if not isinstance(sample, type(u'')):
+                sample = sample.decode('ascii', 'replace')
+            self.unmatched_lines.append(sample)
+
+    def add_time(self, stage, elapsed):
+        self.stage_times[stage] = self.stage_times.get(stage, 0.0) + elapsed
+
+    def merge(self, other):
+        """Add the counts & times of other ParseDiagnostics to these"""
+        for branch, count in other.dispatch_counts.items():
+            self.dispatch_counts[branch] += count
+        self.unmatched += other.unmatched
+        self.unmatched_lines.extend(other.unmatched_lines[:
+            UNMATCHED_SAMPLE - len(self.unmatched_lines)])
+        self.bytes_scanned += other.bytes_scanned
+        for stage, elapsed in other.stage_times.items():
+            self.add_time(stage, elapsed)
+
+
+def iter_lines(data, block_size=BLOCK_SIZE):
+    """Generator yielding lines (without line terminator) from data, 
+    which is read in blocks of block_size bytes
+
+    Lines longer than MAX_LINE_LENGTH are not buffered whole, only their 
+    start, still longer than MAX_LINE_LENGTH, is yielded for the line to 
+    be skipped as overlong.
+    """
+    # Pieces of a line spanning several blocks, joined once it completes
+    pending = []
+    pending_length = 0
+    while True:
+        block = data.read(block_size)
+        if not block:
+            break
+        lines = block.split('\n')
+        if len(lines) == 1:
+            if pending_length <= MAX_LINE_LENGTH:
+                pending.append(block)
+            pending_length += len(block)
+            continue
+        if pending:
+            if pending_length <= MAX_LINE_LENGTH:
+                pending.append(lines[0])
+            lines[0] = ''.join(pending)
+        pending = [lines.pop()]
+        pending_length = len(pending[0])
+        for line in lines:
+            yield line
+    tail = ''.join(pending)
+    if tail:
+        yield tail
+
+
+GZIP_MAGIC = b'\x1f\x8b'
+BZIP2_MAGIC = b'BZh'
+XZ_MAGIC = b'\xfd7zXZ\x00'
+MAGIC_LEN = len(XZ_MAGIC)
+
+
+def is_compressed(file):
+    """Whether the named file is compressed, detected by magic bytes"""
+    with open(file, "rb") as gclog:
+        return _decompressor_type(gclog.read(MAGIC_LEN)) is not None
+
+
+def open_log(data):
+    """Wrap the file like object data in a reader which transparently 
+    decompresses it if compressed, detected by its leading magic bytes.
+    Decompression is streamed, so no temporary file is required.
+    """
+    head = data.read(MAGIC_LEN)
+    decompressor_type = _decompressor_type(head)
+    if decompressor_type is None:
+        return PrefixedReader(head, data)
+    return DecompressingReader(decompressor_type, head, data)
+
+
+def _decompressor_type(head):
+    """Decompressor type for data starting with head, None if plain"""
+    if not isinstance(head, bytes):
+        # Text data can't be compressed
+        return None
+    if head.startswith(GZIP_MAGIC):
+        return lambda: zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if head.startswith(BZIP2_MAGIC):
+        if bz2 is None:
+            raise ParseGCException("bzip2 logs require the bz2 module")
+        return bz2.BZ2Decompressor
+    if head.startswith(XZ_MAGIC):
+        if lzma is None:
+            raise ParseGCException("xz logs require the lzma module")
+        return lzma.LZMADecompressor
+    return None
+
+
+def _text_block(block):
+    """Decode a block of bytes data to str (a no-op in Python 2)"""
+    if isinstance(block, str):
+        return block
+    return block.decode('latin-1')
+
+
+class PrefixedReader(object):
+    """File like object reading prefix followed by the remainder of data"""
+    def __init__(self, prefix, data):
+        self.prefix = prefix
+        self.data = data
+
+    def read(self, size):
+        if self.prefix:
+            block = self.prefix[:size]
+            self.prefix = self.prefix[size:]
         else:
-            #print "Ignoring line: " + line
+            block = self.data.read(size)
+        return _text_block(block)
+
+
+class DecompressingReader(object):
+    """File like object stream decompressing compressed data, including 
+    concatenated streams such as multi-member gzip files
+    """
+    def __init__(self, decompressor_type, head, data):
+        self.decompressor_type = decompressor_type
+        self.decompressor = decompressor_type()
+        self.data = data
+        self.buffer = self._decompress(head)
+
+    def read(self, size):
+        while len(self.buffer) < size:
+            block = self.data.read(BLOCK_SIZE)
+            if not block:
+                break
+            self.buffer += self._decompress(block)
+        block = self.buffer[:size]
+        self.buffer = self.buffer[size:]
+        return _text_block(block)
+
+    def _decompress(self, block):
+        output = []
+        while block:
+            try:
+                output.append(self.decompressor.decompress(block))
+            except EOFError:
+                # The previous stream ended on the last block boundary
+                self.decompressor = self.decompressor_type()
+                continue
+            block = self.decompressor.unused_data
+            if block:
+                self.decompressor = self.decompressor_type()
+        return b''.join(output)
+
+
+def content_key(data, profile=None):
+    """Cache key of the content read from data, the parser version & the 
+    LogProfile forcing the parse, if any
+    """
+    digest = hashlib.sha1(('%d:%s:%s:' % ((PARSER_VERSION,) + 
+        (profile.key if profile is not None else (None, None))))
+        .encode('ascii'))
+    while True:
+        block = data.read(BLOCK_SIZE)
+        if not block:
+            break
+        if not isinstance(block, bytes):
+            block = block.encode('utf-8')
+        digest.update(block)
+    return digest.hexdigest()
+
+
+class ParseCache(object):
+    """Cache of parse results in directory, as GCFrame files named by 
+    their content_key
+
+    The least recently used files are evicted once the total size of the 
+    cache exceeds max_size bytes.
+    """
+    suffix = '.gcframe'
+
+    def __init__(self, directory, max_size=CACHE_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    def get(self, key):
+        """Cached GCFrame for key, or None"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as cached:
+                frame = GCFrame.load(cached)
+            # Recency of use is tracked by modification time
+            os.utime(path, None)
+        except (IOError, OSError, ParseGCException):
             return None
+        return frame
+
+    def put(self, key, frame):
+        path = self._path(key)
+        # Written aside & renamed so readers never see a partial file
+        partial = "%s.%d" % (path, os.getpid())
+        with open(partial, "wb") as cached:
+            frame.dump(cached)
+        os.rename(partial, path)
+        self._evict()
+
+    def _evict(self):
+        """Remove least recently used files until within max_size"""
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith(self.suffix):
+                stat = os.stat(os.path.join(self.directory, name))
+                files.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for mtime, size, name in files)
+        for mtime, size, name in sorted(files):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                # Already evicted by another process
+                pass
+            total -= size
+
+
+INDEX_HEADER = "gcindex %d %d %s\n"
+
+# Length of the start of a log which is hashed to identify it
+INDEX_HEAD_SIZE = 4096
+
+
+def index_path(file):
+    """Path of the index of the named file"""
+    return file + ".idx"
+
+
+def _head_digest(file):
+    with open(file, "rb") as gclog:
+        return hashlib.sha1(gclog.read(INDEX_HEAD_SIZE)).hexdigest()
+
+
+def write_index(file, index, size):
+    """Write the index of the named file, a list of (offset, timestamp) 
+    of every INDEX_INTERVAL entries of the first size bytes of file
+    """
+    path = index_path(file)
+    partial = "%s.%d" % (path, os.getpid())
+    with open(partial, "w") as sidecar:
+        sidecar.write(INDEX_HEADER % (PARSER_VERSION, size, 
+            _head_digest(file)))
+        for offset, timestamp in index:
+            sidecar.write("%d %r\n" % (offset, timestamp))
+    os.rename(partial, path)
+
+
+def read_index(file):
+    """(offsets, timestamps) of the index of the named file, None if it 
+    has no index or the index is out of date
+    """
+    try:
+        with open(index_path(file)) as sidecar:
+            header = sidecar.readline().split()
+            if (len(header) != 4 or header[0] != "gcindex" or 
+                    int(header[1]) != PARSER_VERSION):
+                return None
+            # Logs are appended to, so a log which has shrunk or whose 
+            # start has changed has been replaced
+            if (os.path.getsize(file) < int(header[2]) or 
+                    _head_digest(file) != header[3]):
+                return None
+            offsets = []
+            timestamps = []
+            for line in sidecar:
+                offset, timestamp = line.split()
+                offsets.append(int(offset))
+                timestamps.append(float(timestamp))
+    except (IOError, OSError, ValueError):
+        return None
+    if not offsets:
+        return None
+    return offsets, timestamps
+
+
+def bisect_offset(buf, t, dispatch=None):
+    """Offset of a line of buf, a bytes like object such as an mmap, 
+    which no line with a timestamp of t or later precedes, found in 
+    O(log n) probes without reading buf from the start
+
+    Timestamps must increase through buf. Each probe resynchronises on 
+    the next line start, then reads forward to the first line matching 
+    the timestamp dispatch pattern.
+    """
+    if dispatch is None:
+        dispatch = DEFAULT_PROFILE.bytes_dispatch
+    # Lines starting before lo have earlier timestamps than t, the first 
+    # line with a timestamp of t or later starts no later than hi
+    lo = 0
+    hi = len(buf)
+    while hi - lo > BISECT_SPAN:
+        mid = (lo + hi) // 2
+        pos = buf.find(b'\n', mid, hi) + 1
+        probe = _next_timestamp(buf, pos, hi, dispatch) if pos else None
+        if probe is None:
+            hi = mid
+            continue
+        pos, ts = probe
+        if ts < t:
+            lo = pos
+        else:
+            hi = pos
+    return lo
+
+
+def _next_timestamp(buf, pos, endpos, dispatch):
+    """(offset, timestamp) of the first timestamped line of buf between 
+    pos & endpos, or None
+    """
+    while pos < endpos:
+        eol = buf.find(b'\n', pos, endpos)
+        if eol < 0:
+            eol = endpos
+        ts = dispatch.match(buf, pos, eol)
+        if ts:
+            return pos, float(ts.group('timestamp'))
+        pos = eol + 1
+    return None
+
+
+def _keyed_entries(entries, key, stream, source):
+    """Decorate entries for merging, ordered by key, then stream & seq so 
+    that entries themselves are never compared
+    """
+    get_key = operator.attrgetter(key)
+    for seq, entry in enumerate(entries):
+        yield get_key(entry), stream, seq, source, entry
+
+
+def split_file(file, chunks):
+    """Split file into at most chunks byte ranges aligned to line 
+    boundaries, returning the list of offsets delimiting them
+    """
+    size = os.path.getsize(file)
+    offsets = [0]
+    with open(file, "r") as gclog:
+        for i in range(1, chunks):
+            gclog.seek(max(size * i // chunks, offsets[-1]))
+            gclog.readline()
+            offset = gclog.tell()
+            if offset >= size:
+                break
+            if offset > offsets[-1]:
+                offsets.append(offset)
+    offsets.append(size)
+    return offsets
+
+
+def _parse_chunk(task):
+    """Parse the byte range [start, end) of file, used by worker processes
+
+    The chunk is parsed columnar & its GCFrame returned in the dump 
+    format, which is far cheaper to send back to the parent than pickled 
+    entries, alongside the worker's diagnostics
+    """
+    parser, file, start, end = task
+    # Only the chunk's diagnostics are returned to the parent parser
+    parser.diagnostics = ParseDiagnostics()
+    with open(file, "r") as gclog:
+        gclog.seek(start)
+        frame = parser.parse_data(ChunkReader(gclog, end - start), True)
+    dumped = io.BytesIO()
+    frame.dump(dumped)
+    return dumped.getvalue(), parser.diagnostics
+
+
+class ChunkReader(object):
+    """File like object limiting reads to the next size bytes of data"""
+    def __init__(self, data, size):
+        self.data = data
+        self.remaining = size
+
+    def read(self, size):
+        block = self.data.read(min(size, self.remaining))
+        self.remaining -= len(block)
+        return block
 
 
 # TODO: Check JVM source to confirm 1024 not 1000 should be used
@@ -167,12 +1478,13 @@ def generate_yg_gc_entry(
                 pause_time,
                 user_time,
                 sys_time,
-                real_time):
+                real_time,
+                wall_time=0.0):
     """Generate YoungGenGCEntry from string attribute values"""
     return YoungGenGCEntry(
         float(timestamp),
         float(gc_timestamp or "0"),
-        collector,
+        intern_collector(collector),
         to_bytes(int(yg_util_pre)),
         to_bytes(int(yg_util_post)),
         to_bytes(int(yg_size_post)),
@@ -183,7 +1495,8 @@ def generate_yg_gc_entry(
         float(pause_time),
         float(user_time),
         float(sys_time),
-        float(real_time))
+        float(real_time),
+        wall_time)
 
 def generate_full_gc_entry(
                 timestamp,
@@ -203,12 +1516,13 @@ def generate_full_gc_entry(
                 user_time,
                 sys_time,
                 real_time,
-                system=False):
+                system=False,
+                wall_time=0.0):
     """Generate YoungGenGCEntry from string attribute values"""
     return FullGCEntry(
         float(timestamp),
         float(gc_timestamp or "0"),
-        collector,
+        intern_collector(collector),
         to_bytes(int(tenured_util_pre)),
         to_bytes(int(tenured_util_post)),
         to_bytes(int(tenured_size_post)),
@@ -223,42 +1537,82 @@ def generate_full_gc_entry(
         float(user_time),
         float(sys_time),
         float(real_time),
-        True if system else False)
+        True if system else False,
+        wall_time)
 
 
 class GCEntry(object):
+    """Base class of parsed GC entries
+
+    Entries hold their fields in __slots__ rather than a per-instance 
+    __dict__, with the field order fixed by the _fields tuple of each 
+    subclass. On 64 bit CPython 2.7 this reduces a YoungGenGCEntry from 
+    1424 to 480 bytes & a FullGCEntry from 1520 to 608 bytes, including 
+    the int/float field values (the collector string is shared). The 
+    get_attr* methods continue to present the fields as a dict.
+    """
+    __slots__ = ('collector', 'timestamp', 'wall_time')
+
+    _fields = ()
 
     def __init__(self,
                 collector,
-                timestamp):
+                timestamp,
+                wall_time=0.0):
         self.collector = collector
         self.timestamp = timestamp
+        # Seconds since the epoch of date stamped entries, otherwise 0.0
+        self.wall_time = wall_time
 
     def __eq__(self, 
                 other):
-        if type(other) is type(self):
-            return self.__dict__ == other.__dict__
+        # Entries of the same kind, including lazy entries, share _fields
+        if getattr(other, '_fields', None) is self._fields:
+            return self._values(self) == other._values(other)
         return False
 
+    def __ne__(self, other):
+        return not self == other
+
+    def __reduce__(self):
+        # Pickle as constructor arguments, e.g. for parse_file_parallel
+        return (type(self), self._values(self) + (self.wall_time,))
+
+    def as_tuple(self):
+        """Field values in _fields order"""
+        return self._values(self)
+
     def get_attr(self):
-        return self.__dict__
+        return dict(zip(self._fields, self._values(self)))
 
     def get_attr_keys(self):
-        return self.__dict__.keys()
-
-    def get_attr_values(self):
-        return self.__dict__.values()
+        return list(self._fields)
 
     def get_attr_value(self, key):
-        return self.__dict__[key]
+        if key not in self._field_set:
+            raise KeyError(key)
+        return getattr(self, key)
 
     def get_attr_values(self, dict):
         for key in dict:
-            if key in self.__dict__:
-                dict[key] = self.__dict__[key]
+            if key in self._field_set:
+                dict[key] = getattr(self, key)
         return dict
 
+
 class YoungGenGCEntry(GCEntry):
+
+    # Attribute names, in constructor argument order
+    _fields = ('timestamp', 'gc_timestamp', 'collector', 'yg_util_pre', 
+        'yg_util_post', 'yg_size_post', 'yg_pause_time', 'heap_util_pre',
+        'heap_util_post', 'heap_size_post', 'pause_time', 'user_time',
+        'sys_time', 'real_time')
+    _field_set = frozenset(_fields)
+    _values = operator.attrgetter(*_fields)
+
+    __slots__ = tuple(field for field in _fields 
+        if field not in GCEntry.__slots__)
+
     def __init__(self, 
                 timestamp,
                 gc_timestamp,
@@ -273,8 +1627,10 @@ class YoungGenGCEntry(GCEntry):
                 pause_time,
                 user_time,
                 sys_time,
-                real_time):
-        super(YoungGenGCEntry, self).__init__(collector, timestamp)
+                real_time,
+                wall_time=0.0):
+        super(YoungGenGCEntry, self).__init__(collector, timestamp, 
+            wall_time)
         self.gc_timestamp = gc_timestamp
         self.yg_util_pre = yg_util_pre
         self.yg_util_post = yg_util_post
@@ -290,6 +1646,19 @@ class YoungGenGCEntry(GCEntry):
 
 
 class FullGCEntry(GCEntry):
+
+    # Attribute names, in constructor argument order
+    _fields = ('timestamp', 'gc_timestamp', 'collector', 'tenured_util_pre',
+        'tenured_util_post', 'tenured_size_post', 'tenured_pause_time',
+        'heap_util_pre', 'heap_util_post', 'heap_size_post', 'perm_util_pre',
+        'perm_util_post', 'perm_size_post', 'pause_time', 'user_time',
+        'sys_time', 'real_time', 'system')
+    _field_set = frozenset(_fields)
+    _values = operator.attrgetter(*_fields)
+
+    __slots__ = tuple(field for field in _fields 
+        if field not in GCEntry.__slots__)
+
     def __init__(self,
                 timestamp,
                 gc_timestamp,
@@ -308,8 +1677,10 @@ class FullGCEntry(GCEntry):
                 user_time,
                 sys_time,
                 real_time,
-                system):
-        super(FullGCEntry, self).__init__(collector, timestamp)
+                system,
+                wall_time=0.0):
+        super(FullGCEntry, self).__init__(collector, timestamp, 
+            wall_time)
         self.gc_timestamp = gc_timestamp
         self.tenured_util_pre = tenured_util_pre
         self.tenured_util_post = tenured_util_post
@@ -327,3 +1698,760 @@ class FullGCEntry(GCEntry):
         self.real_time = real_time
         self.system = system
 
+
+class GCLogFollower(object):
+    """Incrementally parses a GC log as it is written by a running JVM
+
+    Each poll only parses the complete lines appended since the previous 
+    poll, a partial trailing line being left until it is completed. New 
+    entries are passed as a list to each callback, so accumulators such 
+    as SummaryStats.update do work proportional to the new lines only.
+
+    The log file is held open between polls, so when the log is rotated 
+    (the path now refers to a different inode) the remainder of the old 
+    file is parsed before following the new file from its start. A file 
+    truncated below the parsed offset, e.g. on JVM restart, is followed 
+    from its start. checkpoint is the (inode, offset) of the last fully 
+    parsed byte & the key of the log's LogProfile, which may be passed to 
+    resume following in a new process.
+
+    Unless the parser has a profile, the profile of each followed file is 
+    sniffed from its first lines that have timestamps, as by 
+    ParseGCLog._sniff, & lines are parsed through its compiled dispatch.
+    """
+    def __init__(self, parser, file, checkpoint=None, callbacks=()):
+        self.parser = parser
+        self.file = file
+        self.callbacks = list(callbacks)
+        self.inode, self.offset = (checkpoint or (None, 0))[:2]
+        # LogProfile sniffed from the followed file, None until sniffed
+        self.profile = None
+        if checkpoint and len(checkpoint) > 2 and checkpoint[2]:
+            self.profile = get_profile(*checkpoint[2])
+        self._gclog = None
+        # Pieces of the incomplete last line read & its whole length
+        self._pending = []
+        self._pending_length = 0
+
+    @property
+    def checkpoint(self):
+        return self.inode, self.offset, self.profile and self.profile.key
+
+    def add_callback(self, callback):
+        self.callbacks.append(callback)
+
+    def close(self):
+        if self._gclog:
+            self._gclog.close()
+            self._gclog = None
+
+    def run(self, interval=1.0):
+        """Poll for new entries every interval secs, until interrupted"""
+        try:
+            while True:
+                self.poll()
+                time.sleep(interval)
+        finally:
+            self.close()
+
+    def poll(self):
+        """Parse the lines appended since the last poll, returning the 
+        new entries after passing them to each callback
+        """
+        entries = []
+        if self._gclog is None:
+            self._open(resume=True)
+        if self._gclog is not None:
+            entries.extend(self._read())
+            try:
+                inode = os.stat(self.file).st_ino
+            except OSError:
+                # Rotation in progress, the new file is not yet created
+                inode = self.inode
+            if inode != self.inode:
+                entries.extend(self._flush_pending())
+                self.close()
+                self._open(resume=False)
+                if self._gclog is not None:
+                    entries.extend(self._read())
+            elif os.fstat(self._gclog.fileno()).st_size < self.offset:
+                self._pending = []
+                self._pending_length = 0
+                self.offset = 0
+                self.profile = None
+                self._gclog.seek(0)
+                entries.extend(self._read())
+
+        if entries:
+            for callback in self.callbacks:
+                callback(entries)
+        return entries
+
+    def _open(self, resume):
+        try:
+            self._gclog = open(self.file, "r")
+        except IOError:
+            return
+        inode = os.fstat(self._gclog.fileno()).st_ino
+        if not resume or inode != self.inode:
+            self.inode, self.offset = inode, 0
+            self.profile = None
+        self._pending = []
+        self._pending_length = 0
+        self._gclog.seek(self.offset)
+
+    def _read(self):
+        """Parse the complete lines between offset & the end of the file"""
+        entries = []
+        while True:
+            block = self._gclog.read(BLOCK_SIZE)
+            if not block:
+                return entries
+            lines = block.split('\n')
+            # Overlong lines are not buffered whole, as by iter_lines
+            if self._pending_length <= MAX_LINE_LENGTH:
+                self._pending.append(lines[0])
+            self._pending_length += len(lines[0])
+            if len(lines) == 1:
+                continue
+            lines[0] = ''.join(self._pending)
+            # Of the pieces of the first line dropped
+            self.offset += self._pending_length - len(lines[0])
+            self._pending = [lines.pop()]
+            self._pending_length = len(self._pending[0])
+            dispatch, handlers = self._sniff(lines)
+            parse_span = self.parser._parse_span
+            for line in lines:
+                self.offset += len(line) + 1
+                result = parse_span(line, 0, len(line), dispatch, handlers)
+                if result:
+                    entries.append(result)
+
+    def _flush_pending(self):
+        """Parse a final line without terminator of a rotated file"""
+        line = ''.join(self._pending)
+        self.offset += self._pending_length
+        self._pending = []
+        self._pending_length = 0
+        if not line:
+            return []
+        dispatch, handlers = self._sniff([line])
+        result = self.parser._parse_span(line, 0, len(line), dispatch, 
+            handlers)
+        return [result] if result else []
+
+    def _sniff(self, lines):
+        """Dispatch & handlers of the followed file's profile, sniffed from 
+        the first SNIFF_LINES of lines once any of them has a timestamp
+
+        Until then, lines such as JVM headers are parsed by the default 
+        profile, as they hold no entries whatever the log's format.
+        """
+        parser = self.parser
+        profile = parser.profile or self.profile
+        if profile is None:
+            head = lines[:SNIFF_LINES]
+            dispatch = DEFAULT_PROFILE.dispatch
+            if not any(dispatch.match(line) for line in head):
+                return parser._compile(DEFAULT_PROFILE)[:2]
+            start = time.time()
+            profile = self.profile = parser.log_profile = sniff_profile(head)
+            parser.diagnostics.add_time('sniff', time.time() - start)
+        return parser._compile(profile)[:2]
+
+
+# 64 bit signed integer array typecode, 'q' is unavailable prior to Python 3.3
+try:
+    array('q')
+    INT64_TYPECODE = 'q'
+except ValueError:
+    INT64_TYPECODE = 'l'
+
+# Event kinds of GCFrame rows, indexing the entry type of the row
+YG_KIND = 0
+FULL_KIND = 1
+KINDS = (YG_KIND, FULL_KIND)
+ENTRY_TYPES = (YoungGenGCEntry, FullGCEntry)
+BRANCH_KINDS = {YG_GC: YG_KIND, FULL_GC: FULL_KIND}
+
+# Conversions of captured field values, as per generate_*_gc_entry
+FLOAT = 0
+OPTIONAL_FLOAT = 1
+KB = 2
+TEXT = 3
+FLAG = 4
+WALL_TIME = 5
+
+"""(pattern group, conversion) of each entry type's fields, in _fields 
+order following the timestamp, used for batched conversion
+"""
+YG_GROUPS = (
+    ('gc_ts', OPTIONAL_FLOAT),
+    ('collector', TEXT),
+    ('yg_pre', KB),
+    ('yg_post', KB),
+    ('yg_sz', KB),
+    ('yg_pause', OPTIONAL_FLOAT),
+    ('heap_pre', KB),
+    ('heap_post', KB),
+    ('heap_sz', KB),
+    ('pause', FLOAT),
+    ('user', FLOAT),
+    ('sys', FLOAT),
+    ('real', FLOAT))
+
+FULL_GROUPS = (
+    ('gc_ts', OPTIONAL_FLOAT),
+    ('collector', TEXT),
+    ('tenured_pre', KB),
+    ('tenured_post', KB),
+    ('tenured_sz', KB),
+    ('tenured_pause', OPTIONAL_FLOAT),
+    ('heap_pre', KB),
+    ('heap_post', KB),
+    ('heap_sz', KB),
+    ('perm_pre', KB),
+    ('perm_post', KB),
+    ('perm_sz', KB),
+    ('perm_pause', FLOAT),
+    ('user', FLOAT),
+    ('sys', FLOAT),
+    ('real', FLOAT),
+    ('system', FLAG))
+
+GROUPS = tuple(tuple(group for group, conversion in groups) 
+    for groups in (YG_GROUPS, FULL_GROUPS))
+# Converted columns are followed by the wall time of each entry
+CONVERSIONS = tuple((FLOAT,) + tuple(conversion 
+    for group, conversion in groups) + (WALL_TIME,)
+    for groups in (YG_GROUPS, FULL_GROUPS))
+
+CONVERTERS = {
+    FLOAT: float,
+    OPTIONAL_FLOAT: lambda value: float(value or '0'),
+    KB: lambda value: int(value) << 10,
+    TEXT: intern_collector,
+    FLAG: lambda value: value is not None,
+}
+
+
+def _lazy_field(entry_type, name, bit, group, conversion):
+    """Property of the named field of a lazy subclass of entry_type, 
+    decoding its group of the entry's match on first access & caching it 
+    in the field's slot of entry_type, marking bit of the entry's decoded 
+    fields
+    """
+    slot = next(klass.__dict__[name] for klass in entry_type.__mro__ 
+        if name in klass.__dict__)
+    convert = CONVERTERS[conversion]
+
+    def get(self):
+        if self._decoded & bit:
+            return slot.__get__(self)
+        value = convert(self._match.group(group))
+        slot.__set__(self, value)
+        self._decoded |= bit
+        return value
+
+    def set(self, value):
+        slot.__set__(self, value)
+        self._decoded |= bit
+
+    return property(get, set)
+
+
+def _lazy_values(entry_type, groups):
+    """_values of a lazy subclass of entry_type, decoding all the fields 
+    not yet decoded at once, rather than one property at a time
+    """
+    names = entry_type._fields[1:]
+    slots = [next(klass.__dict__[name] for klass in entry_type.__mro__ 
+        if name in klass.__dict__) for name in names]
+    converters = [CONVERTERS[conversion] for group, conversion in groups]
+    group_names = [group for group, conversion in groups]
+    values = entry_type._values
+    decoded = (1 << len(names)) - 1
+
+    def lazy_values(entry):
+        if entry._decoded != decoded:
+            for bit, (slot, convert, value) in enumerate(zip(slots, 
+                    converters, entry._match.group(*group_names))):
+                if not entry._decoded & (1 << bit):
+                    slot.__set__(entry, convert(value))
+            entry._decoded = decoded
+            # The line is no longer needed
+            entry._match = None
+        return values(entry)
+
+    return lazy_values
+
+
+class LazyYoungGenGCEntry(YoungGenGCEntry):
+    """YoungGenGCEntry holding the pattern match of its line, so that 
+    each field other than timestamp & wall_time is decoded on first use
+
+    Uses that only read a few fields, such as the pauses, avoid most of 
+    the conversion cost of parsing, but the line is held until all the 
+    fields have been read.
+    """
+    __slots__ = ('_match', '_decoded')
+
+    def __init__(self, timestamp, match, wall_time=0.0):
+        self.timestamp = timestamp
+        self.wall_time = wall_time
+        self._match = match
+        # Bit mask of the fields decoded, in _fields order after timestamp
+        self._decoded = 0
+
+    def __reduce__(self):
+        return (YoungGenGCEntry, self._values(self) + (self.wall_time,))
+
+
+class LazyFullGCEntry(FullGCEntry):
+    """FullGCEntry decoding its fields on first use, as per 
+    LazyYoungGenGCEntry
+    """
+    __slots__ = ('_match', '_decoded')
+
+    def __init__(self, timestamp, match, wall_time=0.0):
+        self.timestamp = timestamp
+        self.wall_time = wall_time
+        self._match = match
+        self._decoded = 0
+
+    def __reduce__(self):
+        return (FullGCEntry, self._values(self) + (self.wall_time,))
+
+
+def _add_lazy_fields(lazy_type, groups):
+    """Add the lazy field properties of groups to lazy_type"""
+    entry_type = lazy_type.__bases__[0]
+    for bit, (name, (group, conversion)) in enumerate(
+            zip(entry_type._fields[1:], groups)):
+        setattr(lazy_type, name, 
+            _lazy_field(entry_type, name, 1 << bit, group, conversion))
+    lazy_type._values = staticmethod(_lazy_values(entry_type, groups))
+
+
+_add_lazy_fields(LazyYoungGenGCEntry, YG_GROUPS)
+_add_lazy_fields(LazyFullGCEntry, FULL_GROUPS)
+
+
+"""Hand written tokenizers of the young & full GC entry shapes, an 
+alternative to matching their patterns selected by 
+ParseGCLog(tokenizer=True). Each scans its line once from left to 
+right, finding the literal text following each field & validating the 
+field's characters, so no line costs more than a linear scan however 
+it is malformed.
+
+Unlike the patterns of a LogProfile, the tokenizers accept any 
+collector names & datestamped GC timestamps within entries, & only 
+tokenize text, entries parsed from bytes are always matched.
+"""
+class _NoMatch(Exception):
+    pass
+
+
+_datestamp = re.compile(DATESTAMP + "$")
+
+
+def _is_name(token):
+    return token.isalpha()
+
+
+def _is_decimal(token):
+    whole, dot, fraction = token.partition('.')
+    return dot and whole.isdigit() and fraction.isdigit()
+
+
+def _is_perm_name(token):
+    # One or two words, optionally followed by a space
+    words = token[:-1].split(' ') if token.endswith(' ') else token.split(' ')
+    return len(words) <= 2 and all(_is_name(word) for word in words)
+
+
+def _expect(line, pos, literal):
+    """Position following literal at pos of line"""
+    if not line.startswith(literal, pos):
+        raise _NoMatch
+    return pos + len(literal)
+
+
+def _token(line, pos, stop, endpos, valid):
+    """(token, position following stop) of the text of line from pos up 
+    to the literal stop, which must be valid
+    """
+    end = line.find(stop, pos, endpos)
+    if end < 0:
+        raise _NoMatch
+    token = line[pos:end]
+    if not valid(token):
+        raise _NoMatch
+    return token, end + len(stop)
+
+
+def _skip_space(line, pos, endpos):
+    while pos < endpos and line[pos].isspace():
+        pos += 1
+    return pos
+
+
+def _sizes(line, pos, endpos):
+    """(pre, post, size, position following) of preK->postK(sizeK)"""
+    arrow = line.find('K->', pos, endpos)
+    paren = line.find('K(', arrow + 3, endpos)
+    end = line.find('K)', paren + 2, endpos)
+    if arrow < 0 or paren < 0 or end < 0:
+        raise _NoMatch
+    pre, post, size = (line[pos:arrow], line[arrow + 3:paren], 
+        line[paren + 2:end])
+    if not (pre.isdigit() and post.isdigit() and size.isdigit()):
+        raise _NoMatch
+    return pre, post, size, end + 2
+
+
+def _gc_timestamp(line, pos, endpos, datestamps=None):
+    """(GC timestamp or None, position of the '[' following) of the 
+    optional datestamp & GC timestamp of an entry, accepted as by 
+    GC_TIMESTAMPS[datestamps]
+    """
+    bracket = line.find('[', pos, endpos)
+    if bracket < 0:
+        raise _NoMatch
+    segment = line[pos:bracket]
+    if segment.startswith(' '):
+        segment = segment[1:]
+    elif datestamps is not True:
+        # Only Java 7 date stamped logs omit the separating space
+        raise _NoMatch
+    gc_ts = None
+    if segment:
+        if not segment.endswith(': '):
+            raise _NoMatch
+        stamps = segment[:-2].split(': ')
+        if _is_decimal(stamps[-1]):
+            gc_ts = stamps.pop()
+        if len(stamps) > 1 or (stamps and (datestamps is False or 
+                not _datestamp.match(stamps[0]))):
+            raise _NoMatch
+    return gc_ts, bracket
+
+
+def _generation(line, pos, endpos):
+    """(collector, pre, post, size, pause or None, position following 
+    the ']') of [Collector: preK->postK(sizeK)[, pause secs]] at pos
+    """
+    collector, pos = _token(line, _expect(line, pos, '['), ': ', endpos, 
+        _is_name)
+    pre, post, size, pos = _sizes(line, pos, endpos)
+    pause = None
+    if line.startswith(', ', pos):
+        pause, pos = _token(line, pos + 2, ' secs', endpos, _is_decimal)
+    return collector, pre, post, size, pause, _expect(line, pos, ']')
+
+
+def _times(line, pos, endpos):
+    """(user, sys, real) of the [Times: ...] following pos"""
+    pos = _expect(line, _skip_space(line, pos, endpos), '[Times: user=')
+    user, pos = _token(line, pos, ' sys=', endpos, _is_decimal)
+    sys, pos = _token(line, pos, ' real=', endpos, 
+        lambda token: _is_decimal(token[:-1] if token.endswith(',') 
+            else token))
+    real, pos = _token(line, pos, ' secs]', endpos, _is_decimal)
+    return user, sys.rstrip(','), real
+
+
+class Tokens(tuple):
+    """Fields of an entry found by a tokenizer, in the GROUPS order of 
+    the entry's kind, supporting the group method of pattern matches 
+    """
+    __slots__ = ()
+
+    def group(self, *names):
+        index = self._index
+        if len(names) == 1:
+            return self[index[names[0]]]
+        return tuple([self[index[name]] for name in names])
+
+
+class YoungGenGCTokens(Tokens):
+    __slots__ = ()
+    _index = dict((group, i) for i, group in enumerate(GROUPS[YG_KIND]))
+
+
+class FullGCTokens(Tokens):
+    __slots__ = ()
+    _index = dict((group, i) for i, group in enumerate(GROUPS[FULL_KIND]))
+
+
+def tokenize_yg_gc(line, pos=0, endpos=None, datestamps=None):
+    """YoungGenGCTokens of the young GC entry of line between pos & 
+    endpos, or None if it is not a young GC entry of a log with datestamps 
+    as per DATESTAMP_PREFIXES
+    """
+    if endpos is None:
+        endpos = len(line)
+    try:
+        pos = _expect(line, _skip_space(line, pos, endpos), '[GC')
+        gc_ts, pos = _gc_timestamp(line, pos, endpos, datestamps)
+        collector, yg_pre, yg_post, yg_sz, yg_pause, pos = _generation(
+            line, pos, endpos)
+        heap_pre, heap_post, heap_sz, pos = _sizes(line, 
+            _skip_space(line, pos, endpos), endpos)
+        pause, pos = _token(line, _expect(line, pos, ', '), ' secs]', 
+            endpos, _is_decimal)
+        user, sys, real = _times(line, pos, endpos)
+    except _NoMatch:
+        return None
+    return YoungGenGCTokens((gc_ts, collector, yg_pre, yg_post, yg_sz, 
+        yg_pause, heap_pre, heap_post, heap_sz, pause, user, sys, real))
+
+
+def tokenize_full_gc(line, pos=0, endpos=None, datestamps=None):
+    """FullGCTokens of the full GC entry of line between pos & endpos, 
+    or None if it is not a full GC entry of a log with datestamps as per 
+    DATESTAMP_PREFIXES
+    """
+    if endpos is None:
+        endpos = len(line)
+    try:
+        pos = _expect(line, _skip_space(line, pos, endpos), '[Full GC')
+        system = None
+        if line.startswith(' (System)', pos):
+            system, pos = 'System', pos + 9
+        gc_ts, pos = _gc_timestamp(line, pos, endpos, datestamps)
+        generation = _generation(line, pos, endpos)
+        pos = generation[-1]
+        if generation[4] is None and line.startswith(' [', pos):
+            # The young generation, preceding the old
+            generation = _generation(line, pos + 1, endpos)
+            pos = generation[-1]
+        (collector, tenured_pre, tenured_post, tenured_sz, tenured_pause, 
+            pos) = generation
+        heap_pre, heap_post, heap_sz, pos = _sizes(line, 
+            _skip_space(line, pos, endpos), endpos)
+        if line.startswith(',', pos):
+            pos += 1
+        perm, pos = _token(line, _expect(line, pos, ' ['), ':', endpos, 
+            _is_perm_name)
+        perm_pre, perm_post, perm_sz, pos = _sizes(line, 
+            _expect(line, pos, ' '), endpos)
+        perm_pause, pos = _token(line, _expect(line, pos, '], '), ' secs]', 
+            endpos, _is_decimal)
+        user, sys, real = _times(line, pos, endpos)
+    except _NoMatch:
+        return None
+    return FullGCTokens((gc_ts, collector, tenured_pre, tenured_post, 
+        tenured_sz, tenured_pause, heap_pre, heap_post, heap_sz, perm_pre, 
+        perm_post, perm_sz, perm_pause, user, sys, real, system))
+
+
+"""Tokenizer & handler method name of the branches ParseGCLog can 
+tokenize rather than match
+"""
+TOKENIZERS = {
+    YG_GC: (tokenize_yg_gc, '_parse_yg_gc_tokens'),
+    FULL_GC: (tokenize_full_gc, '_parse_full_gc_tokens'),
+}
+
+
+FLOAT_COLUMNS = ('timestamp', 'gc_timestamp', 'yg_pause_time', 
+    'tenured_pause_time', 'pause_time', 'user_time', 'sys_time', 
+    'real_time', 'wall_time')
+INT_COLUMNS = ('yg_util_pre', 'yg_util_post', 'yg_size_post', 
+    'tenured_util_pre', 'tenured_util_post', 'tenured_size_post', 
+    'heap_util_pre', 'heap_util_post', 'heap_size_post', 'perm_util_pre', 
+    'perm_util_post', 'perm_size_post')
+
+
+class GCFrame(object):
+    """Columnar store of GC entries
+
+    Each numeric field is held in a typed array column, with fields not 
+    applicable to an entry's kind stored as 0. The kind column holds 
+    YG_KIND or FULL_KIND per row, & the collector column codes into the 
+    interned collectors list. Whole columns can be used directly by hot 
+    paths, whilst indexing or iterating the frame returns equivalent 
+    YoungGenGCEntry/FullGCEntry row views for existing code.
+    """
+    def __init__(self):
+        self.kind = array('b')
+        self.collector = array('H')
+        self.system = array('b')
+        self.collectors = []
+        self._collector_codes = {}
+        self.columns = {}
+        for name in FLOAT_COLUMNS:
+            self.columns[name] = array('d')
+        for name in INT_COLUMNS:
+            self.columns[name] = array(INT64_TYPECODE)
+
+    @classmethod
+    def from_entries(cls, entries):
+        frame = cls()
+        frame.extend(entries)
+        return frame
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def append(self, entry):
+        if isinstance(entry, YoungGenGCEntry):
+            self.kind.append(YG_KIND)
+            self.system.append(0)
+        elif isinstance(entry, FullGCEntry):
+            self.kind.append(FULL_KIND)
+            self.system.append(1 if entry.system else 0)
+        else:
+            raise ParseGCException("Unsupported GC entry type " + 
+                str(type(entry)))
+
+        self.collector.append(self._collector_code(entry.collector))
+
+        for name, column in self.columns.items():
+            column.append(getattr(entry, name, 0))
+
+    def extend_frame(self, frame):
+        """Append the rows of another GCFrame, recoding its collectors"""
+        codes = [self._collector_code(collector) 
+            for collector in frame.collectors]
+        self.kind.extend(frame.kind)
+        self.collector.extend([codes[code] for code in frame.collector])
+        self.system.extend(frame.system)
+        for name, column in self.columns.items():
+            column.extend(frame.columns[name])
+
+    def extend_batch(self, kinds, columns):
+        """Append a batch of converted columns, as yielded by 
+        ParseGCLog.iter_batches, without building entries
+        """
+        fields = [dict(zip(ENTRY_TYPES[kind]._fields + ('wall_time',), 
+            columns[kind])) for kind in KINDS]
+
+        self.kind.extend(kinds)
+        self.collector.extend([self._collector_code(collector) 
+            for collector in _interleave(kinds, fields, 'collector')])
+        self.system.extend([1 if system else 0 
+            for system in _interleave(kinds, fields, 'system')])
+        for name, column in self.columns.items():
+            column.extend(_interleave(kinds, fields, name))
+
+    def _collector_code(self, collector):
+        """Interned code of collector name"""
+        code = self._collector_codes.get(collector)
+        if code is None:
+            code = self._collector_codes[collector] = len(self.collectors)
+            self.collectors.append(collector)
+        return code
+
+    def dump(self, fileobj):
+        """Write the frame to fileobj in a compact binary format of its 
+        raw columns, which GCFrame.load reads back without parsing
+        """
+        collectors = '\n'.join(self.collectors).encode('utf-8')
+        fileobj.write(FRAME_HEADER.pack(FRAME_MAGIC, PARSER_VERSION, 
+            len(self), len(collectors)))
+        fileobj.write(collectors)
+        for column in self._all_columns():
+            fileobj.write(_array_bytes(column))
+
+    @classmethod
+    def load(cls, fileobj):
+        """Read a frame written by dump from fileobj"""
+        header = fileobj.read(FRAME_HEADER.size)
+        if len(header) != FRAME_HEADER.size:
+            raise ParseGCException("Truncated GC frame")
+        magic, version, rows, length = FRAME_HEADER.unpack(header)
+        if magic != FRAME_MAGIC or version != PARSER_VERSION:
+            raise ParseGCException("Unsupported GC frame version")
+
+        frame = cls()
+        collectors = fileobj.read(length).decode('utf-8')
+        if collectors:
+            for collector in collectors.split('\n'):
+                frame._collector_code(intern_collector(str(collector)))
+        for column in frame._all_columns():
+            size = rows * column.itemsize
+            data = fileobj.read(size)
+            if len(data) != size:
+                raise ParseGCException("Truncated GC frame")
+            _array_extend_bytes(column, data)
+        return frame
+
+    def _all_columns(self):
+        """All column arrays, in a fixed order"""
+        return [self.kind, self.collector, self.system] + [
+            self.columns[name] for name in FLOAT_COLUMNS + INT_COLUMNS]
+
+    def column(self, name):
+        """Column array of the named field"""
+        return self.columns[name]
+
+    def numpy_column(self, name):
+        """Column of the named field as a NumPy array sharing its memory"""
+        if numpy is None:
+            raise ParseGCException("NumPy is not available")
+        column = getattr(self, name, None)
+        if not isinstance(column, array):
+            column = self.columns[name]
+        return numpy.frombuffer(column, dtype=column.typecode)
+
+    def __len__(self):
+        return len(self.kind)
+
+    def __iter__(self):
+        for index in range(len(self.kind)):
+            yield self[index]
+
+    def __getitem__(self, index):
+        """YoungGenGCEntry or FullGCEntry row view at index"""
+        entry_type = ENTRY_TYPES[self.kind[index]]
+        values = []
+        for name in entry_type._fields:
+            if name == 'collector':
+                values.append(self.collectors[self.collector[index]])
+            elif name == 'system':
+                values.append(bool(self.system[index]))
+            else:
+                values.append(self.columns[name][index])
+        values.append(self.columns['wall_time'][index])
+        return entry_type(*values)
+
+
+# Header of GCFrame.dump files: magic, parser version, rows & length of 
+# the collector names
+FRAME_HEADER = struct.Struct('<4sIQI')
+FRAME_MAGIC = b'GCF1'
+
+
+def _array_bytes(column):
+    """Raw bytes of an array (tostring was renamed tobytes in Python 3)"""
+    if hasattr(column, 'tobytes'):
+        return column.tobytes()
+    return column.tostring()
+
+
+def _array_extend_bytes(column, data):
+    if hasattr(column, 'frombytes'):
+        column.frombytes(data)
+    else:
+        column.fromstring(data)
+
+
+def _interleave(kinds, fields, name):
+    """Values of the named field in kinds order, from the per kind field
+    columns, with 0 for entries of kinds which do not have the field
+    """
+    columns = [fields[kind].get(name) for kind in KINDS]
+    for column in columns:
+        # Batches commonly contain a single kind
+        if column is not None and len(column) == len(kinds):
+            return column
+    values = [iter(column) if column is not None else itertools.repeat(0)
+        for column in columns]
+    return [next(values[kind]) for kind in kinds]
+
+
+class ParseGCException(Exception):
+    pass
@@ -1,15 +1,50 @@
+import itertools
+import math
 import sys
 
-from collections import OrderedDict
+from collections import OrderedDict, deque
 
-from parsegc import FullGCEntry, YoungGenGCEntry
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from parsegc import FULL_KIND, YG_KIND, FullGCEntry, YoungGenGCEntry
+
+# Percentiles of pause times reported
+PAUSE_PERCENTILES = (50, 90, 99, 99.9)
+
+# Percentile of allocation & promotion rates reported
+RATE_PERCENTILE = 99
+
+# Lengths (secs) of the sliding windows of GC overhead reported
+OVERHEAD_WINDOWS = (1, 10, 60)
 
 class SummaryStats(object):
-    """Object for calculating various summary statistics on GC data"""
-    def __init__(self, gc_data):
+    """Object for calculating various summary statistics on GC data
+
+    gc_data may be any iterable of GC entries, such as the generator 
+    returned by ParseGCLog.iter_parse, as it is only walked once. Further 
+    entries can be added with update, e.g. as a GCLogFollower callback, 
+    & the stats of consecutive parts of a log, such as its chunks or 
+    rotated files, combined with merge or from_partials. The stats of a 
+    GCFrame are computed from its columns by from_frame. The worst GC 
+    overhead is reported for sliding windows of each of windows secs.
+    """
+    # Stats accumulated per entry, combined by merge
+    _accumulators = ('yg_size', 'heap_size', 'perm_size', 'tenured_size', 
+        'yg_reclaimed', 'heap_reclaimed', 'perm_reclaimed', 
+        'tenured_reclaimed', 'yg_elapsed_duration', 'full_elapsed_duration',
+        'yg_duration', 'full_duration', 'yg_pauses', 'full_pauses', 'rates')
+
+    def __init__(self, gc_data=(), windows=OVERHEAD_WINDOWS):
 
         self.stats = OrderedDict({})
 
+        self.events = 0
+        self.first_timestamp = 0.0
+        self.last_timestamp = 0.0
+
         self.yg_size = IntStats()
         self.heap_size = IntStats()
         self.perm_size = IntStats()
@@ -22,17 +57,88 @@ class SummaryStats(object):
         self.full_elapsed_duration = FloatStats()
         self.yg_duration = FloatStats()
         self.full_duration = FloatStats()
-
+        self.yg_pauses = QuantileHistogram()
+        self.full_pauses = QuantileHistogram()
+        self.rates = RateStats()
+        self.overheads = [WindowStats(window) for window in windows]
+
+        self.update(gc_data)
+
+
+    @classmethod
+    def from_partials(cls, partials):
+        """SummaryStats of the entries of several SummaryStats, in log 
+        order, combined without walking their entries again
+
+        Raises ValueError, as merge, if the pauses of partials overlap 
+        such that they can't be combined, e.g. partials of different JVMs, 
+        which should be summarised from their entries merged in order by 
+        ParseGCLog.iter_merge instead.
+        """
+        summary = cls()
+        for partial in partials:
+            summary.merge(partial)
+        return summary
+
+    @classmethod
+    def from_frame(cls, frame):
+        """SummaryStats of the entries of a GCFrame, see update_frame"""
+        summary = cls()
+        summary.update_frame(frame)
+        return summary
+
+    def update(self, gc_data):
+        """Add further GC entries to the stats"""
         self._generate_stats(gc_data)
-        self._generate_results(gc_data)
-
+        self._generate_results()
+
+    def update_frame(self, frame):
+        """Add the entries of a GCFrame to the stats, by vectorised 
+        reductions of its columns where NumPy is available, otherwise by 
+        walking its rows as update does. Either gives the same stats.
+        """
+        if numpy is None:
+            return self.update(frame)
+        self._generate_frame_stats(frame)
+        self._generate_results()
+
+    def merge(self, other):
+        """Add the stats of other, of entries following these, in O(1)
+
+        Raises ValueError, leaving these stats unchanged, if pauses of 
+        these overlap those of other that aren't kept, see 
+        WindowStats.merge.
+        """
+        if len(other.overheads) != len(self.overheads):
+            raise ValueError("Stats of %d GC overhead windows can't be "
+                "merged with stats of %d" % (len(other.overheads), 
+                len(self.overheads)))
+        for overhead, other_overhead in zip(self.overheads, other.overheads):
+            overhead.check_merge(other_overhead)
+        if other.events:
+            if not self.events:
+                self.first_timestamp = other.first_timestamp
+            self.last_timestamp = other.last_timestamp
+            self.events += other.events
+        for name in self._accumulators:
+            getattr(self, name).merge(getattr(other, name))
+        for overhead, other_overhead in zip(self.overheads, other.overheads):
+            overhead.merge(other_overhead)
+        self._generate_results()
 
     def _generate_stats(self, gc_data):
 
         for entry in gc_data:
+            self.events += 1
+            if self.events == 1:
+                self.first_timestamp = entry.timestamp
+            self.last_timestamp = entry.timestamp
+
             self.heap_size.process(entry.heap_size_post)
             self.heap_reclaimed.process(
                 entry.heap_util_pre - entry.heap_util_post)
+            for overhead in self.overheads:
+                overhead.process(entry)
 
             if isinstance(entry, YoungGenGCEntry):
                 self._generate_yg_stats(entry)
@@ -40,12 +146,59 @@ class SummaryStats(object):
                 self._generate_full_stats(entry)
 
 
+    def _generate_frame_stats(self, frame):
+        """Vectorised equivalent of _generate_stats for a GCFrame"""
+        if not len(frame):
+            return
+
+        def column(name):
+            return _array(frame.columns[name])
+
+        timestamp = column('timestamp')
+        if not self.events:
+            self.first_timestamp = timestamp[0].item()
+        self.last_timestamp = timestamp[-1].item()
+        self.events += len(frame)
+
+        self.heap_size.process_array(column('heap_size_post'))
+        self.heap_reclaimed.process_array(
+            column('heap_util_pre') - column('heap_util_post'))
+        for overhead in self.overheads:
+            overhead.process_arrays(timestamp, column('pause_time'))
+
+        kind = _array(frame.kind)
+        yg = kind == YG_KIND
+        self.yg_size.process_array(column('yg_size_post')[yg])
+        self.yg_reclaimed.process_array(
+            (column('yg_util_pre') - column('yg_util_post'))[yg])
+        self.yg_elapsed_duration.process_array(column('real_time')[yg])
+        self.yg_duration.process_array(column('pause_time')[yg])
+        self.yg_pauses.process_array(column('pause_time')[yg])
+        self.rates.process_arrays(timestamp[yg], column('yg_util_pre')[yg],
+            column('yg_util_post')[yg], 
+            ((column('yg_util_pre') - column('yg_util_post')) - 
+                (column('heap_util_pre') - column('heap_util_post')))[yg])
+
+        full = kind == FULL_KIND
+        self.perm_size.process_array(column('perm_size_post')[full])
+        self.tenured_size.process_array(column('tenured_size_post')[full])
+        self.perm_reclaimed.process_array(
+            (column('perm_util_pre') - column('perm_util_post'))[full])
+        self.tenured_reclaimed.process_array(
+            (column('tenured_util_pre') - column('tenured_util_post'))[full])
+        self.full_elapsed_duration.process_array(column('real_time')[full])
+        self.full_duration.process_array(column('pause_time')[full])
+        self.full_pauses.process_array(column('pause_time')[full])
+
+
     def _generate_yg_stats(self, entry):
         """YG GC entry specific stats"""
         self.yg_size.process(entry.yg_size_post)
         self.yg_reclaimed.process(entry.yg_util_pre - entry.yg_util_post)
         self.yg_elapsed_duration.process(entry.real_time)
         self.yg_duration.process(entry.pause_time)
+        self.yg_pauses.process(entry.pause_time)
+        self.rates.process(entry)
 
 
     def _generate_full_stats(self, entry):
@@ -57,21 +210,48 @@ class SummaryStats(object):
             entry.tenured_util_pre - entry.tenured_util_post)
         self.full_elapsed_duration.process(entry.real_time)
         self.full_duration.process(entry.pause_time)
+        self.full_pauses.process(entry.pause_time)
 
 
-    def _generate_results(self, gc_data):
+    def _generate_results(self):
         """Generate dictionary of results stats"""
-        events = len(gc_data)
-        self.stats['Total Events'] = events
+        self.stats['Total Events'] = self.events
 
         self.stats['Elapsed Time'] = '%.3f ' % \
-            (gc_data[-1].timestamp - gc_data[0].timestamp) + ' secs'
+            (self.last_timestamp - self.first_timestamp) + ' secs'
 
         self.stats['Time spent in Full GC'] = '%.3f ' % \
             (self.full_duration.total) + ' secs'
         self.stats['Time spent in YG GC'] = '%.3f ' % \
             (self.yg_duration.total) + ' secs'
 
+        for name, pauses in (('YG', self.yg_pauses), 
+                ('Full', self.full_pauses)):
+            self.stats[name + ' Pause ' + ' / '.join('p%g' % percentile 
+                for percentile in PAUSE_PERCENTILES) + ' (Max)'] = \
+                ' / '.join('%.3f' % pause for pause in pauses.quantiles(
+                    [percentile / 100.0 for percentile in PAUSE_PERCENTILES])
+                ) + ' (%.3f) secs' % pauses.max
+
+        for name, rates, quantiles in (
+                ('Allocation', self.rates.allocation, 
+                    self.rates.allocation_quantiles), 
+                ('Promotion', self.rates.promotion, 
+                    self.rates.promotion_quantiles)):
+            self.stats[name + ' Rate Min / Avg / p%g' % RATE_PERCENTILE] = \
+                ' / '.join(float_bytes_human_readable(rate) for rate in (
+                    rates.min if rates.count else 0.0, rates.average, 
+                    quantiles.quantile(RATE_PERCENTILE / 100.0))) + '/sec'
+
+        windows = ' / '.join('%gs' % overhead.window 
+            for overhead in self.overheads)
+        self.stats['Worst GC Overhead ' + windows] = ' / '.join(
+            '%.2f%% at %.3f' % (100 * overhead.max_overhead, 
+                overhead.worst_end or 0.0) 
+            for overhead in self.overheads) + ' secs'
+        self.stats['Max Collections per ' + windows] = ' / '.join(
+            '%d' % overhead.max_collections for overhead in self.overheads)
+
         self.stats['Heap Start / End (Peak)'] = \
             int_bytes_human_readable(self.heap_size.first) + ' / ' + \
             int_bytes_human_readable(self.heap_size.last) + ' (' + \
@@ -107,6 +287,11 @@ class SummaryStats(object):
             self.tenured_reclaimed.average)
 
 
+def _array(values):
+    """NumPy array viewing the typed array values"""
+    return numpy.frombuffer(values, dtype=values.typecode)
+
+
 def int_bytes_human_readable(size):
     """Convert integer byte value into human readable form"""
     suffix = ['B','KB','MB','GB','TB']
@@ -121,22 +306,33 @@ def float_bytes_human_readable(size, precision=2):
     """Convert float byte value into human readable form"""
     suffix = ['B','KB','MB','GB','TB']
     index = 0
-    while size >= 1024 and index != len(suffix) - 1:
+    while abs(size) >= 1024 and index != len(suffix) - 1:
         index += 1
         size /= 1024.0
     return "%.*f %s" % (precision, size, suffix[index])
 
 
-class IntStats(object):
-    """Object for aggregating and storing integer results"""
+class Stats(object):
+    """Single pass aggregation of count, min, max, first, last, total & 
+    the mean & variance of values
+
+    The mean & variance are accumulated by Welford's method, which avoids 
+    the loss of precision of summing squares. Stats of consecutive runs 
+    of values are combined by merge, which is associative, so the stats 
+    of chunks, files or JVMs can be accumulated independently.
+    """
+    zero = 0
+
     def __init__(self):
-        self.count = 0
-        self.min = sys.maxint
-        self.max = 0
-        self.first = 0
-        self.last = 0
-        self.total = 0
-        self.average = 0
+        self.count = self.zero
+        self.min = self.initial_min
+        self.max = self.zero
+        self.first = self.zero
+        self.last = self.zero
+        self.total = self.zero
+        self.mean = 0.0
+        # Sum of squared differences from the mean
+        self.m2 = 0.0
 
     def process(self, value):
         self.count += 1
@@ -148,32 +344,479 @@ class IntStats(object):
             self.first = value
         self.last = value
         self.total += value
-        # Moving average
-        self.average = (value + ((self.count - 1) * self.average))\
-            / self.count
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def process_array(self, values):
+        """Process each of a NumPy array of values, by vectorised 
+        reductions
+        """
+        if not len(values):
+            return
+        partial = type(self)()
+        partial.count = self.zero + len(values)
+        partial.min = values.min().item()
+        partial.max = values.max().item()
+        partial.first = values[0].item()
+        partial.last = values[-1].item()
+        if values.dtype.kind == 'f':
+            # Summed in order, as by process, for an identical total
+            partial.total = values.cumsum()[-1].item()
+        else:
+            partial.total = values.sum().item()
+        partial.mean = values.mean().item()
+        partial.m2 = ((values - partial.mean) ** 2).sum().item()
+        self.merge(partial)
+
+    def merge(self, other):
+        """Add the stats of other, of values following these"""
+        if not other.count:
+            return
+        if not self.count:
+            self.first = other.first
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.last = other.last
+        self.total += other.total
+
+    @property
+    def average(self):
+        if not self.count:
+            return self.zero
+        return self.total / self.count
+
+    @property
+    def variance(self):
+        """Population variance of the values"""
+        if not self.count:
+            return 0.0
+        return self.m2 / self.count
+
+
+class IntStats(Stats):
+    """Object for aggregating and storing integer results
+
+    The average is that of integer division of the exact total.
+    """
+    initial_min = sys.maxint
+
+
+class FloatStats(Stats):
+    """Object for aggregating and storing float results"""
+    zero = 0.0
+    initial_min = sys.float_info.max
 
 
-class FloatStats(object):
-    """Object for aggregating and storing float results"""
+class RateStats(object):
+    """Allocation & promotion rates, in bytes/sec, over the intervals 
+    between consecutive YG collections
+
+    The allocation of an interval is the growth of YG occupancy from 
+    after one YG collection to before the next, & its promotion that of 
+    the YG reclaimed by the next collection which was not reclaimed from 
+    the heap, so was moved to tenured. Intervals of no elapsed time have 
+    no rates. Rates of consecutive runs of YG collections are combined 
+    by merge, which includes the interval spanning them.
+    """
     def __init__(self):
-        self.count = 0.0
-        self.min = sys.float_info.max
+        self.allocation = FloatStats()
+        self.promotion = FloatStats()
+        self.allocation_quantiles = QuantileHistogram()
+        self.promotion_quantiles = QuantileHistogram()
+        # (timestamp, yg_util_pre, promoted) of the first YG collection
+        self.first = None
+        # (timestamp, yg_util_post) of the last YG collection
+        self.last = None
+
+    def process(self, entry):
+        """Process a YG GC entry, returning the (allocation, promotion) 
+        rates of the interval it ends, or None if there are none
+        """
+        promoted = (entry.yg_util_pre - entry.yg_util_post) - \
+            (entry.heap_util_pre - entry.heap_util_post)
+        collection = (entry.timestamp, entry.yg_util_pre, promoted)
+        if self.first is None:
+            self.first = collection
+        rates = self._process_collection(collection)
+        self.last = (entry.timestamp, entry.yg_util_post)
+        return rates
+
+    def process_arrays(self, timestamp, yg_util_pre, yg_util_post, promoted):
+        """Process the YG collections of NumPy arrays of their columns & 
+        the bytes each promoted, by vectorised reductions
+        """
+        if not len(timestamp):
+            return
+        partial = RateStats()
+        partial.first = (timestamp[0].item(), yg_util_pre[0].item(), 
+            promoted[0].item())
+        partial.last = (timestamp[-1].item(), yg_util_post[-1].item())
+        interval = timestamp[1:] - timestamp[:-1]
+        elapsed = interval > 0
+        interval = interval[elapsed]
+        allocation = (yg_util_pre[1:] - yg_util_post[:-1])[elapsed] / interval
+        promotion = promoted[1:][elapsed] / interval
+        partial.allocation.process_array(allocation)
+        partial.allocation_quantiles.process_array(allocation)
+        partial.promotion.process_array(promotion)
+        partial.promotion_quantiles.process_array(promotion)
+        self.merge(partial)
+
+    def merge(self, other):
+        """Add the rates of other, of YG collections following these"""
+        if other.first is None:
+            return
+        if self.first is None:
+            self.first = other.first
+        else:
+            self._process_collection(other.first)
+        self.allocation.merge(other.allocation)
+        self.promotion.merge(other.promotion)
+        self.allocation_quantiles.merge(other.allocation_quantiles)
+        self.promotion_quantiles.merge(other.promotion_quantiles)
+        self.last = other.last
+
+    def _process_collection(self, collection):
+        """Process the interval from the last YG collection to the 
+        (timestamp, yg_util_pre, promoted) of the next
+        """
+        if self.last is None:
+            return None
+        timestamp, yg_util_pre, promoted = collection
+        interval = timestamp - self.last[0]
+        if interval <= 0:
+            return None
+        allocation = (yg_util_pre - self.last[1]) / interval
+        promotion = promoted / interval
+        self.allocation.process(allocation)
+        self.allocation_quantiles.process(allocation)
+        self.promotion.process(promotion)
+        self.promotion_quantiles.process(promotion)
+        return allocation, promotion
+
+
+class WindowStats(object):
+    """GC overhead, the fraction of wall time paused, & the number of 
+    collections of sliding windows of window secs
+
+    A window ends at the end of each pause, so the worst window is that 
+    ending at the end of one. The pauses of the current window are kept 
+    in a deque, added at its end & evicted from its start as it slides, 
+    with a running total of the time paused, so each pause is visited 
+    twice rather than each window summed. Time paused by overlapping 
+    pauses is counted once. Stats of consecutive runs of pauses are 
+    combined by merge, which replays the pauses of other whose windows 
+    reach back to the pauses before it.
+    """
+    def __init__(self, window):
+        self.window = window
+        self.count = 0
+        # End of the first pause
+        self.first_end = None
+        # End of the latest pause
+        self.end = float('-inf')
+        # Running total of the time paused
+        self.paused = 0.0
+        # (timestamp, pause_time, start, length, end, paused before) of 
+        # each pause overlapping the current window, start & length 
+        # excluding any overlap with the pauses before
+        self.pauses = deque()
+        # (timestamp, pause_time) of the pauses ending within window secs 
+        # of the end of the first
+        self.head = []
+        self.max_overhead = 0.0
+        self.worst_end = None
+        self.max_collections = 0
+
+    def process(self, entry):
+        """Process a GC entry, returning the (overhead, collections) of 
+        the window ending at the end of its pause
+        """
+        return self._process_pause(entry.timestamp, entry.pause_time)
+
+    def process_arrays(self, timestamp, pause_time):
+        """Process the pauses of NumPy arrays of their timestamp & 
+        pause_time columns, by vectorised searches of their windows
+        """
+        if not len(timestamp):
+            return
+        partial = WindowStats(self.window)
+        partial.count = len(timestamp)
+        end = numpy.maximum.accumulate(timestamp + pause_time)
+        partial.first_end = end[0].item()
+        previous_end = numpy.concatenate(([float('-inf')], end[:-1]))
+        overlapped = timestamp < previous_end
+        start = numpy.where(overlapped, previous_end, timestamp)
+        length = numpy.where(overlapped, numpy.maximum(
+            timestamp + pause_time - previous_end, 0.0), pause_time)
+        paused = numpy.cumsum(length)
+        paused_before = numpy.concatenate(([0.0], paused[:-1]))
+        window_start = end - self.window
+        # First pause of each window, the first ending after its start
+        first = numpy.searchsorted(end, window_start, side='right')
+        overhead = numpy.minimum((paused - paused_before[first] - 
+            numpy.minimum(numpy.maximum(window_start - start[first], 0.0), 
+                length[first])) / self.window, 1.0)
+        collections = numpy.arange(1, len(timestamp) + 1) - first
+        worst = int(numpy.argmax(overhead))
+        partial.max_overhead = overhead[worst].item()
+        partial.worst_end = end[worst].item()
+        partial.max_collections = collections.max().item()
+        partial.end = end[-1].item()
+        partial.paused = paused[-1].item()
+        last = int(first[-1])
+        partial.pauses = deque(zip(*[column[last:].tolist() for column in 
+            (timestamp, pause_time, start, length, end, paused_before)]))
+        head = int(numpy.searchsorted(end, partial.first_end + self.window))
+        partial.head = list(zip(timestamp[:head].tolist(), 
+            pause_time[:head].tolist()))
+        self.merge(partial)
+
+    def merge(self, other):
+        """Add the stats of other, of pauses following these, which must 
+        be of windows of the same length
+
+        Raises ValueError, before any stats are changed, if a pause of 
+        these ends after the first of other, & so may overlap pauses of 
+        other it has not kept, see check_merge.
+        """
+        if not other.count:
+            return
+        if not self.count:
+            for name, value in vars(other).items():
+                setattr(self, name, value)
+            self.pauses = deque(other.pauses)
+            self.head = list(other.head)
+            return
+        count = self.count + other.count
+
+        known, replay = self._replayed(other)
+        for timestamp, pause_time in known[:replay]:
+            self._process_pause(timestamp, pause_time)
+
+        # Pauses of other's last window not replayed are taken as they 
+        # are, except the first may have started before the end of these
+        adopted = list(other.pauses)[
+            max(replay - other.count + len(other.pauses), 0):]
+        if adopted:
+            timestamp, pause_time, start, length, end, before = adopted[0]
+            if start < self.end:
+                start = self.end
+                length = max(timestamp + pause_time - self.end, 0.0)
+            window_start = other.end - self.window
+            self.pauses = deque(pause for pause in self.pauses 
+                if pause[4] > window_start)
+            self.pauses.append(
+                (timestamp, pause_time, start, length, end, self.paused))
+            self.paused += length
+            # Running totals of other rebased on those of these
+            offset = self.paused - (before + adopted[0][3])
+            for timestamp, pause_time, start, length, end, before in \
+                    adopted[1:]:
+                self.pauses.append((timestamp, pause_time, start, length, 
+                    end, before + offset))
+            if len(adopted) > 1:
+                self.paused = other.paused + offset
+            self.end = max(self.end, other.end)
+
+        if other.max_overhead > self.max_overhead:
+            self.max_overhead = other.max_overhead
+            self.worst_end = other.worst_end
+        self.max_collections = max(self.max_collections, 
+            other.max_collections)
+        self.count = count
+
+    def check_merge(self, other):
+        """Raise ValueError if other can't be merged with these, being of 
+        windows of another length or of pauses overlapping these that 
+        other has not kept
+        """
+        if other.window != self.window:
+            raise ValueError("Windows of %r secs can't be merged with "
+                "windows of %r secs" % (other.window, self.window))
+        if self.count and other.count:
+            self._replayed(other)
+
+    def _replayed(self, other):
+        """(leading pauses of other kept, number of them to replay) of 
+        merging other, raising ValueError if those kept are too few
+        """
+        # Leading pauses of other kept, its head & any of its last window 
+        # following on from it
+        known = list(other.head)
+        overlap = len(other.head) + len(other.pauses) - other.count
+        if overlap >= 0:
+            known.extend(pause[:2] for pause in list(other.pauses)[overlap:])
+        # Other's windows reaching back before the end of these were 
+        # missing these pauses, so are replayed, later windows were not
+        replay = 0
+        end = float('-inf')
+        for timestamp, pause_time in known:
+            end = max(end, timestamp + pause_time)
+            if end - self.window >= self.end:
+                break
+            replay += 1
+        else:
+            if len(known) < other.count and self.end > other.first_end:
+                raise ValueError("GC overhead of pauses to %.3f secs can't "
+                    "be merged with that of overlapping pauses following "
+                    "%.3f secs" % (self.end, other.first_end))
+        return known, replay
+
+    def _process_pause(self, timestamp, pause_time):
+        self.count += 1
+        if self.count == 1:
+            self.first_end = timestamp + pause_time
+        if timestamp < self.end:
+            start = self.end
+            length = max(timestamp + pause_time - self.end, 0.0)
+        else:
+            start = timestamp
+            length = pause_time
+        self.end = max(self.end, timestamp + pause_time)
+        before = self.paused
+        self.paused += length
+        self.pauses.append(
+            (timestamp, pause_time, start, length, self.end, before))
+        if len(self.head) == self.count - 1 and \
+                self.end < self.first_end + self.window:
+            self.head.append((timestamp, pause_time))
+
+        window_start = self.end - self.window
+        while self.pauses[0][4] <= window_start:
+            self.pauses.popleft()
+        # Excluding any part of the first pause before the window, & 
+        # capped at 1.0 as the running total may round above the window
+        first = self.pauses[0]
+        overhead = min((self.paused - first[5] - min(
+            max(window_start - first[2], 0.0), first[3])) / self.window, 1.0)
+        collections = len(self.pauses)
+        if self.worst_end is None or overhead > self.max_overhead:
+            self.max_overhead = overhead
+            self.worst_end = self.end
+        if collections > self.max_collections:
+            self.max_collections = collections
+        return overhead, collections
+
+
+class QuantileHistogram(object):
+    """Streaming quantiles of values, such as pause times or rates, in 
+    bounded memory
+
+    Values are counted in logarithmically sized buckets by magnitude, 
+    bucket i holding the values in (gamma ** (i - 1), gamma ** i] where 
+    gamma = (1 + relative_error) / (1 - relative_error), with a mirrored 
+    set of buckets for negative values, & are reported as the value 
+    2 * gamma ** i / (gamma + 1) within relative_error of each (negated 
+    if negative). So quantiles are within relative_error (1% by default) 
+    of the value of that rank, except values of magnitude below 
+    min_value, which are counted & reported as 0. Memory is bounded by 
+    the number of buckets spanning the range of values, ~1400 from 1us 
+    to 10**6 secs at 1%. min & max are exact, & histograms with the same 
+    parameters merge exactly.
+    """
+    def __init__(self, relative_error=0.01, min_value=1e-6):
+        self.relative_error = relative_error
+        self.min_value = min_value
+        self.gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self.gamma)
+        self.count = 0
+        self.zeros = 0
+        self.min = 0.0
         self.max = 0.0
-        self.first = 0.0
-        self.last = 0.0
-        self.total = 0.0
-        self.average = 0.0
+        self.buckets = {}
+        self.negative_buckets = {}
 
     def process(self, value):
-        self.count += 1.0
-        if value < self.min:
+        self.count += 1
+        if self.count == 1 or value < self.min:
             self.min = value
-        if value > self.max:
+        if self.count == 1 or value > self.max:
             self.max = value
-        if self.count == 1.0:
-            self.first = value
-        self.last = value
-        self.total += value
-        # Moving average
-        self.average = (value + ((self.count - 1.0) * self.average))\
-            / (self.count)
\ No newline at end of file
+        if abs(value) < self.min_value:
+            self.zeros += 1
+            return
+        buckets = self.buckets if value > 0 else self.negative_buckets
+        index = int(math.ceil(math.log(abs(value)) / self._log_gamma))
+        buckets[index] = buckets.get(index, 0) + 1
+
+    def process_array(self, values):
+        """Process each of a NumPy array of values, by vectorised 
+        reductions
+        """
+        if not len(values):
+            return
+        partial = QuantileHistogram(self.relative_error, self.min_value)
+        partial.count = len(values)
+        partial.min = values.min().item()
+        partial.max = values.max().item()
+        positive = values[values >= self.min_value]
+        negative = -values[values <= -self.min_value]
+        partial.zeros = len(values) - len(positive) - len(negative)
+        partial.buckets = self._array_buckets(positive)
+        partial.negative_buckets = self._array_buckets(negative)
+        self.merge(partial)
+
+    def _array_buckets(self, magnitudes):
+        """Bucket counts of a NumPy array of magnitudes"""
+        scaled = numpy.log(magnitudes) / self._log_gamma
+        indices = numpy.ceil(scaled)
+        # NumPy's log may differ from math.log in the last bit, so values 
+        # at bucket boundaries are bucketed as by process
+        for i in numpy.nonzero(
+                numpy.abs(scaled - numpy.rint(scaled)) < 1e-9)[0]:
+            indices[i] = math.ceil(math.log(magnitudes[i]) / self._log_gamma)
+        indices, counts = numpy.unique(indices.astype(numpy.int64), 
+            return_counts=True)
+        return dict(zip(indices.tolist(), counts.tolist()))
+
+    def merge(self, other):
+        """Add the values counted by other, which must have the same 
+        relative_error & min_value
+        """
+        if not other.count:
+            return
+        if not self.count or other.min < self.min:
+            self.min = other.min
+        if not self.count or other.max > self.max:
+            self.max = other.max
+        self.count += other.count
+        self.zeros += other.zeros
+        for buckets, other_buckets in ((self.buckets, other.buckets), 
+                (self.negative_buckets, other.negative_buckets)):
+            for index, count in other_buckets.items():
+                buckets[index] = buckets.get(index, 0) + count
+
+    def quantiles(self, qs):
+        """Values of the ascending quantiles qs (0 to 1), each the value 
+        of rank ceil(q * count) of the values counted, or 0.0 if none
+        """
+        results = []
+        if not self.count:
+            return [0.0] * len(qs)
+        # (value, count) of each bucket in ascending order of value
+        buckets = itertools.chain(
+            ((-2 * self.gamma ** index / (self.gamma + 1), count) 
+                for index, count in 
+                sorted(self.negative_buckets.items(), reverse=True)),
+            [(0.0, self.zeros)],
+            ((2 * self.gamma ** index / (self.gamma + 1), count) 
+                for index, count in sorted(self.buckets.items())))
+        seen = 0
+        for q in qs:
+            # Allow for q * count being fractionally above an integer
+            rank = max(int(math.ceil(q * self.count - 1e-9)), 1)
+            while seen < rank:
+                value, count = next(buckets)
+                seen += count
+            results.append(min(max(value, self.min), self.max))
+        return results
+
+    def quantile(self, q):
+        return self.quantiles([q])[0]
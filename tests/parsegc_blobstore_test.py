@@ -14,6 +14,7 @@ from google.appengine.ext import blobstore
 from google.appengine.api.blobstore import blobstore_stub, file_blob_storage
 from google.appengine.api.files import file_service_stub
 from google.appengine.api import datastore_file_stub
+from google.appengine.api import memcache
 from google.appengine.ext import db
 from google.appengine.ext import testbed
 
@@ -170,4 +171,69 @@ class ParseGCBlobTest(unittest.TestCase):
             
             print "Expected: " + str(entry.__dict__)
             print "Actual:   " + str(results[i].__dict__)"""
-        
+
+
+class MemcacheParseCacheTest(unittest.TestCase):
+
+    path = os.path.dirname(os.path.abspath(__file__)) + "/"
+    sample_file = path + "gc-sample.log"
+
+    def setUp(self):
+        self.testbed = testbed.Testbed()
+        self.testbed.activate()
+        self.testbed.init_memcache_stub()
+
+        self.frame = ParseGCLog().parse_file(self.sample_file, True)
+        self.cache = gc_datastore.MemcacheParseCache()
+        # Small chunks, so the sample's frame spans several batches
+        self.chunk_size = gc_datastore.MEMCACHE_CHUNK_SIZE
+        gc_datastore.MEMCACHE_CHUNK_SIZE = 64
+
+    def tearDown(self):
+        gc_datastore.MEMCACHE_CHUNK_SIZE = self.chunk_size
+        self.testbed.deactivate()
+
+    def _chunk(self, key, i):
+        return memcache.get('%s:%d' % (key, i), 
+            namespace=self.cache.namespace)
+
+    def test_put_get(self):
+        self.cache.put('key', self.frame)
+        self.assertTrue(self._chunk('key', 
+            gc_datastore.MEMCACHE_BATCH_CHUNKS) is not None)
+        self.assertEqual(list(self.cache.get('key')), list(self.frame))
+
+        # A frame missing an evicted chunk misses
+        memcache.delete('key:1', namespace=self.cache.namespace)
+        self.assertEqual(self.cache.get('key'), None)
+
+    def test_oversized(self):
+        """Frames of over MEMCACHE_MAX_CHUNKS chunks aren't cached"""
+        max_chunks = gc_datastore.MEMCACHE_MAX_CHUNKS
+        gc_datastore.MEMCACHE_MAX_CHUNKS = 2
+        try:
+            self.cache.put('oversized', self.frame)
+        finally:
+            gc_datastore.MEMCACHE_MAX_CHUNKS = max_chunks
+        self.assertEqual(self.cache.get('oversized'), None)
+        self.assertEqual(self._chunk('oversized', 0), None)
+
+    def test_partial_write(self):
+        """Frames are only found once all of their chunks are written"""
+        set_multi = memcache.set_multi
+        batches = []
+
+        def failing_set_multi(mapping, **kwargs):
+            batches.append(len(mapping))
+            if len(batches) == 2:
+                return list(mapping)
+            return set_multi(mapping, **kwargs)
+
+        memcache.set_multi = failing_set_multi
+        try:
+            self.cache.put('partial', self.frame)
+        finally:
+            memcache.set_multi = set_multi
+        self.assertEqual(batches, [gc_datastore.MEMCACHE_BATCH_CHUNKS] * 2)
+        self.assertTrue(self._chunk('partial', 0) is not None)
+        self.assertEqual(self.cache.get('partial'), None)
@@ -57,4 +57,26 @@ class ParseGCLogTest(unittest.TestCase):
             self.csv_writer, 
             False, 
             self.result_file)
-        self.assertTrue(filecmp.cmp(self.result_file, expected_file))
\ No newline at end of file
+        self.assertTrue(filecmp.cmp(self.result_file, expected_file))
+
+    def test_generate_allocation_rate_csv(self):
+        expected_file = self.path + "expected_allocation_rate.csv"
+        result = self.parser.parse_file(self.sample_file)
+        graph.generate_graph(None, 
+            graph.ALLOCATION_RATE, 
+            result, 
+            self.csv_writer, 
+            False, 
+            self.result_file)
+        self.assertTrue(filecmp.cmp(self.result_file, expected_file))
+
+    def test_generate_gc_overhead_csv(self):
+        expected_file = self.path + "expected_gc_overhead.csv"
+        result = self.parser.parse_file(self.sample_file)
+        graph.generate_graph(None, 
+            graph.GC_OVERHEAD, 
+            result, 
+            self.csv_writer, 
+            False, 
+            self.result_file)
+        self.assertTrue(filecmp.cmp(self.result_file, expected_file))
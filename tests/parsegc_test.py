@@ -1,8 +1,20 @@
+import bz2
+import gzip
+import io
+import os
+import pickle
+import shutil
+import tempfile
 import unittest
 
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
 import parsegc
 
-from parsegc import ParseGCLog, YoungGenGCEntry, FullGCEntry
+from parsegc import ParseGCLog, YoungGenGCEntry, FullGCEntry, GCFrame
 # TODO
 # 1. Mangled old MSC entries (see TODOs below)
 # 2. CMS failure schenarios
@@ -73,6 +85,9 @@ CMS_FAILURE = "468.231: [GC 468.232: [ParNew (promotion failed): 471872K->471872
 
 class ParseGCTest(unittest.TestCase):
     """GC entry parsing test cases"""
+
+    path = os.path.dirname(os.path.abspath(__file__)) + "/"
+    sample_file = path + "gc-sample.log"
     
     def setUp(self):
         self.parser = ParseGCLog()
@@ -543,4 +558,666 @@ class ParseGCTest(unittest.TestCase):
         result = self.parser.parse(CMS_INITIAL_MARK)
         self.assertIsNone(result)
 
+    def test_iter_parse(self):
+        """Entries spanning block boundaries are streamed intact"""
+        lines = [SERIAL_ENTRY1, CMS_MARK_START, PARALLEL_ENTRY1, 
+            PARNEW_CMS_FULL, CMS_INITIAL_MARK, PAR_NEW_ENTRY1]
+        data = '\n'.join(lines)
+        expected = [self.parser.parse(line) for line in lines 
+            if self.parser.parse(line)]
+
+        for block_size in (1, 7, 64, 1 << 16):
+            results = self.parser.iter_parse(StringIO(data), block_size)
+            self.assertEqual(list(results), expected)
+
+        self.assertEqual(self.parser.parse_data(StringIO(data)), expected)
+
+    def test_parse_file_parallel(self):
+        expected = self.parser.parse_file(self.sample_file)
+        offsets = parsegc.split_file(self.sample_file, 4)
+        self.assertEqual(offsets[0], 0)
+        self.assertEqual(offsets[-1], os.path.getsize(self.sample_file))
+        self.assertEqual(offsets, sorted(set(offsets)))
+
+        result = self.parser.parse_file_parallel(self.sample_file, 2, 4)
+        self.assertEqual(result, expected)
+        frame = self.parser.parse_file_parallel(self.sample_file, 2, 4, 
+            columnar=True)
+        self.assertEqual(list(frame), expected)
+        self.assertEqual(frame.collectors, 
+            self.parser.parse_file(self.sample_file, True).collectors)
+
+    def test_dispatch_counts(self):
+        lines = [SERIAL_ENTRY1, PARNEW_CMS_FULL, CMS_INITIAL_MARK, 
+            CMS_MARK_START, YG_OCCUPANCY, CMS_FAILURE,
+            "30.185: Total time for which application threads were stopped: 0.0172420 seconds",
+            "Heap", ""]
+        for line in lines:
+            self.parser.parse(line)
+
+        counts = self.parser.dispatch_counts
+        self.assertEqual(counts[parsegc.YG_GC], 2)
+        self.assertEqual(counts[parsegc.FULL_GC], 1)
+        self.assertEqual(counts[parsegc.CMS_INITIAL_MARK], 1)
+        self.assertEqual(counts[parsegc.APP_STOPPED], 1)
+        self.assertEqual(counts[parsegc.UNSUPPORTED], 2)
+        self.assertEqual(counts[parsegc.NO_TIMESTAMP], 2)
+
+    def test_diagnostics(self):
+        broken = "2.000: [GC 2.000: [ParNew: 1K->"
+        lines = [SERIAL_ENTRY1, broken, CMS_MARK_START, "Heap"] + [
+            "x" * (parsegc.SAMPLE_LENGTH + 1)] * parsegc.UNMATCHED_SAMPLE
+        data = "\n".join(lines)
+        parser = ParseGCLog()
+        self.assertEqual(len(parser.parse_data(StringIO(data))), 1)
+
+        diagnostics = parser.diagnostics
+        self.assertEqual(diagnostics.dispatch_counts[parsegc.YG_GC], 2)
+        self.assertEqual(diagnostics.dispatch_counts[parsegc.UNSUPPORTED], 1)
+        self.assertEqual(diagnostics.unmatched, 2 + parsegc.UNMATCHED_SAMPLE)
+        self.assertEqual(diagnostics.unmatched_lines[:2], [broken, "Heap"])
+        self.assertEqual(len(diagnostics.unmatched_lines), 
+            parsegc.UNMATCHED_SAMPLE)
+        self.assertEqual(len(diagnostics.unmatched_lines[-1]), 
+            parsegc.SAMPLE_LENGTH)
+        self.assertEqual(diagnostics.bytes_scanned, 
+            len(data) - (len(lines) - 1))
+        self.assertTrue(diagnostics.stage_times['parse'] >= 
+            diagnostics.stage_times['sniff'])
+
+        # Parallel workers' diagnostics are merged
+        self.parser.parse_file(self.sample_file)
+        parser = ParseGCLog()
+        parser.parse_file_parallel(self.sample_file, 2, 4)
+        self.assertEqual(parser.dispatch_counts, self.parser.dispatch_counts)
+        self.assertEqual(parser.diagnostics.bytes_scanned, 
+            self.parser.diagnostics.bytes_scanned)
+
+    def test_line_guard(self):
+        expected = self.parser.parse(PARNEW_CMS_FULL)
+        padded = PARNEW_CMS_FULL + " " * parsegc.MAX_LINE_LENGTH
+        garbage = "\x00" * 100 + PARNEW_CMS_FULL
+        for line in (padded, garbage, SERIAL_ENTRY1 + "\x00"):
+            self.assertEqual(self.parser.parse(line), None)
+        self.assertEqual(self.parser.parse(PARNEW_CMS_FULL), expected)
+        self.assertEqual(self.parser.dispatch_counts[parsegc.SKIPPED], 3)
+        self.assertEqual(self.parser.dispatch_counts[parsegc.FULL_GC], 2)
+
+        data = "\n".join([SERIAL_YG1, padded, garbage, SERIAL_FULL])
+        parser = ParseGCLog()
+        self.assertEqual(len(parser.parse_data(StringIO(data))), 2)
+        self.assertEqual(parser.dispatch_counts[parsegc.SKIPPED], 2)
+        parser = ParseGCLog()
+        self.assertEqual(len(list(parser.iter_parse_buffer(
+            data.encode('ascii')))), 2)
+        self.assertEqual(parser.dispatch_counts[parsegc.SKIPPED], 2)
+
+        # Lines without a terminator are not buffered beyond the guard
+        blob = "x" * (parsegc.MAX_LINE_LENGTH * 16)
+        data = "\n".join([SERIAL_YG1, blob, SERIAL_FULL])
+        lines = list(parsegc.iter_lines(StringIO(data), 64))
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(parsegc.MAX_LINE_LENGTH < len(lines[1]) <= 
+            parsegc.MAX_LINE_LENGTH + 64)
+        parser = ParseGCLog()
+        self.assertEqual(len(list(parser.iter_parse(StringIO(data), 64))), 2)
+        self.assertEqual(parser.dispatch_counts[parsegc.SKIPPED], 1)
+
+    def test_gc_frame(self):
+        lines = [SERIAL_ENTRY1, PARALLEL_ENTRY1, PARNEW_CMS_FULL, 
+            CMS_MARK_START, PARALLEL_MARKSWEEP_ADAPTIVE_SYSTEM]
+        entries = [self.parser.parse(line) for line in lines
+            if self.parser.parse(line)]
+
+        frame = self.parser.parse_data(StringIO('\n'.join(lines)), 
+            columnar=True)
+        self.assertEqual(len(frame), 4)
+        self.assertEqual(list(frame), entries)
+        self.assertEqual(frame[-1], entries[-1])
+        self.assertEqual(list(frame.kind), 
+            [parsegc.YG_KIND, parsegc.YG_KIND, parsegc.FULL_KIND, 
+            parsegc.FULL_KIND])
+        self.assertEqual(frame.collectors, 
+            ['DefNew', 'PSYoungGen', 'CMS', 'ParOldGen'])
+        self.assertEqual(list(frame.system), [0, 0, 0, 1])
+        self.assertEqual(list(frame.column('pause_time')), 
+            [entry.pause_time for entry in entries])
+        # Fields not applicable to the entry kind are stored as 0
+        self.assertEqual(list(frame.column('perm_size_post')), 
+            [0, 0, 21248 << 10, 21248 << 10])
+
+        # Appended frames' collector codes are recoded into the frame's own
+        merged = GCFrame.from_entries(entries[2:])
+        merged.extend_frame(frame)
+        self.assertEqual(list(merged), entries[2:] + entries)
+        self.assertEqual(merged.collectors, 
+            ['CMS', 'ParOldGen', 'DefNew', 'PSYoungGen'])
+
+    def test_entry_attr(self):
+        """Slot based entries still support the get_attr* dict methods"""
+        entry = self.parser.parse(PARALLEL_ENTRY1)
+        self.assertFalse(hasattr(entry, '__dict__'))
+        self.assertEqual(entry.as_tuple(), tuple(
+            entry.get_attr()[field] for field in YoungGenGCEntry._fields))
+        self.assertEqual(sorted(entry.get_attr_keys()), 
+            sorted(YoungGenGCEntry._fields))
+        self.assertEqual(entry.get_attr_value('collector'), 'PSYoungGen')
+        self.assertRaises(KeyError, entry.get_attr_value, 'perm_util_pre')
+        self.assertEqual(entry.get_attr_values(
+            {'pause_time': None, 'perm_util_pre': None}),
+            {'pause_time': 0.0292595, 'perm_util_pre': None})
+
+        full_entry = self.parser.parse(PARNEW_CMS_SYSTEM)
+        self.assertNotEqual(entry, full_entry)
+        self.assertEqual(pickle.loads(pickle.dumps(full_entry)), full_entry)
+
+    def test_parse_file_mmap(self):
+        expected = self.parser.parse_file(self.sample_file)
+        self.assertEqual(self.parser.parse_file_mmap(self.sample_file), 
+            expected)
+
+        lines = [SERIAL_ENTRY1, CMS_MARK_START, PARNEW_CMS_SYSTEM, ""]
+        data = '\n'.join(lines).encode('ascii')
+        expected = [self.parser.parse(SERIAL_ENTRY1), 
+            self.parser.parse(PARNEW_CMS_SYSTEM)]
+        self.assertEqual(list(self.parser.iter_parse_buffer(data)), expected)
+
+    def test_iter_parse_batched(self):
+        lines = [SERIAL_ENTRY1, PARNEW_CMS_FULL, CMS_MARK_START, 
+            PARALLEL_ENTRY1, PARALLEL_MARKSWEEP_ADAPTIVE_SYSTEM, 
+            PARALLEL_MARKSWEEP_ADAPTIVE_YG1, PARNEW_MSC_YG2]
+        data = '\n'.join(lines)
+        expected = self.parser.parse_data(StringIO(data))
+
+        for batch_size in (1, 2, 3, 100):
+            results = self.parser.iter_parse_batched(StringIO(data), 
+                batch_size)
+            self.assertEqual(list(results), expected)
+
+    def test_convert_column(self):
+        self.assertEqual(parsegc.convert_column(['1', '1024'], parsegc.KB), 
+            [1 << 10, 1 << 20])
+        self.assertEqual(parsegc.convert_column(['0.0291520', None], 
+            parsegc.OPTIONAL_FLOAT), [0.029152, 0.0])
+        self.assertEqual(parsegc.convert_column([None, 'System'], 
+            parsegc.FLAG), [False, True])
+
+    def test_follow(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            log = os.path.join(tmp_dir, "gc.log")
+            polled = []
+
+            def append(data):
+                with open(log, "a") as gclog:
+                    gclog.write(data)
+
+            # The log mixes formats, so isn't parsed by a sniffed profile
+            parser = ParseGCLog(profile=parsegc.DEFAULT_PROFILE)
+            follower = parser.follow(log)
+            follower.add_callback(polled.append)
+            self.assertEqual(follower.poll(), [])
+
+            append(SERIAL_ENTRY1 + "\n" + CMS_MARK_START + "\n")
+            self.assertEqual(follower.poll(), 
+                [self.parser.parse(SERIAL_ENTRY1)])
+
+            # Partial trailing lines are parsed once complete
+            append(PARALLEL_ENTRY1[:40])
+            self.assertEqual(follower.poll(), [])
+            checkpoint = follower.checkpoint
+            append(PARALLEL_ENTRY1[40:] + "\n")
+            self.assertEqual(follower.poll(), 
+                [self.parser.parse(PARALLEL_ENTRY1)])
+
+            # A new follower resumes from a checkpoint
+            resumed = parser.follow(log, checkpoint)
+            self.assertEqual(resumed.poll(), 
+                [self.parser.parse(PARALLEL_ENTRY1)])
+            resumed.close()
+
+            # The old file is drained on rotation, then the new followed
+            append(PAR_NEW_ENTRY1 + "\n")
+            os.rename(log, log + ".1")
+            append(PARNEW_CMS_FULL + "\n")
+            self.assertEqual(follower.poll(), 
+                [self.parser.parse(PAR_NEW_ENTRY1), 
+                self.parser.parse(PARNEW_CMS_FULL)])
+
+            # Truncated files are followed from the start
+            with open(log, "w") as gclog:
+                gclog.write(PARNEW_CMS_YG1[:20])
+            follower.poll()
+            append(PARNEW_CMS_YG1[20:] + "\n")
+            self.assertEqual(follower.poll(), 
+                [self.parser.parse(PARNEW_CMS_YG1)])
+
+            # Overlong lines are not buffered whole, but are counted in 
+            # the offset
+            blob = "x" * (parsegc.MAX_LINE_LENGTH * 4)
+            append(blob)
+            self.assertEqual(follower.poll(), [])
+            append(blob)
+            self.assertEqual(follower.poll(), [])
+            self.assertTrue(sum(len(piece) for piece in follower._pending) 
+                <= parsegc.MAX_LINE_LENGTH + len(blob))
+            append("\n" + SERIAL_ENTRY1 + "\n")
+            self.assertEqual(follower.poll(), 
+                [self.parser.parse(SERIAL_ENTRY1)])
+            self.assertEqual(follower.offset, os.path.getsize(log))
+            follower.close()
+
+            self.assertEqual(len(polled), 5)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_follow_datestamps(self):
+        """Followed logs are parsed by the profile sniffed from them"""
+        date = "2014-07-17T12:55:36.155+0200: "
+        young = date + "0.298: [GC" + date + "0.298: [ParNew: 17024K->2112K(19136K), 0.0126670 secs] 17024K->4060K(61312K), 0.0127620 secs] [Times: user=0.02 sys=0.00, real=0.01 secs] "
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            log = os.path.join(tmp_dir, "gc.log")
+            with open(log, "w") as gclog:
+                gclog.write("Java HotSpot(TM) 64-Bit Server VM\n")
+            follower = self.parser.follow(log)
+            self.assertEqual(follower.poll(), [])
+            self.assertEqual(follower.profile, None)
+
+            with open(log, "a") as gclog:
+                gclog.write(young + "\n" + date + PARNEW_CMS_FULL + "\n" + 
+                    young)
+            expected = self.parser.parse_file(log)
+            self.assertEqual(len(expected), 3)
+            self.assertEqual(follower.poll(), expected[:2])
+            profile = parsegc.get_profile(parsegc.CMS, True)
+            self.assertEqual(follower.profile, profile)
+            self.assertEqual(follower.checkpoint[2], profile.key)
+
+            # The profile is resumed from the checkpoint
+            resumed = self.parser.follow(log, follower.checkpoint)
+            self.assertEqual(resumed.profile, profile)
+            with open(log, "a") as gclog:
+                gclog.write("\n")
+            self.assertEqual(resumed.poll(), expected[2:])
+            resumed.close()
+            follower.close()
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_compressed(self):
+        """gzip & bzip2 logs are detected & stream decompressed"""
+        lines = [SERIAL_ENTRY1, CMS_MARK_START, PARALLEL_ENTRY1, 
+            PARNEW_CMS_FULL, CMS_INITIAL_MARK, PAR_NEW_ENTRY1]
+        data = ('\n'.join(lines) + '\n').encode('ascii')
+        expected = self.parser.parse_data(StringIO(data.decode('ascii')))
+
+        def gzipped(data):
+            compressed = io.BytesIO()
+            gclog = gzip.GzipFile(fileobj=compressed, mode="wb")
+            gclog.write(data)
+            gclog.close()
+            return compressed.getvalue()
+
+        half = len(data) // 2
+        for compressed in (gzipped(data), bz2.compress(data), 
+                # Multi-member gzip, e.g. concatenated rotated logs
+                gzipped(data[:half]) + gzipped(data[half:])):
+            self.assertEqual(
+                self.parser.parse_data(io.BytesIO(compressed)), expected)
+            self.assertEqual(list(self.parser.iter_parse(
+                io.BytesIO(compressed), 7)), expected)
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            log = os.path.join(tmp_dir, "gc.log.gz")
+            with open(log, "wb") as gclog:
+                gclog.write(gzipped(data))
+            self.assertTrue(parsegc.is_compressed(log))
+            self.assertEqual(self.parser.parse_file(log), expected)
+            self.assertEqual(list(self.parser.iter_parse_mmap(log)), 
+                expected)
+            self.assertEqual(len(self.parser.parse_file(log, True)), 
+                len(expected))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_parse_cache(self):
+        lines = [SERIAL_ENTRY1, CMS_MARK_START, PARALLEL_ENTRY1, 
+            PARNEW_CMS_FULL, PARALLEL_MARKSWEEP_ADAPTIVE_SYSTEM]
+        data = '\n'.join(lines)
+        expected = self.parser.parse_data(StringIO(data))
+
+        # Frames round trip through their binary format
+        frame = GCFrame.from_entries(expected)
+        dumped = io.BytesIO()
+        frame.dump(dumped)
+        dumped.seek(0)
+        loaded = GCFrame.load(dumped)
+        self.assertEqual(list(loaded), expected)
+        self.assertEqual(loaded.collectors, frame.collectors)
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            cache = parsegc.ParseCache(os.path.join(tmp_dir, "cache"))
+            parser = ParseGCLog(cache=cache)
+            self.assertEqual(parser.parse_data(StringIO(data)), expected)
+            self.assertEqual(parser.dispatch_counts[parsegc.YG_GC], 2)
+
+            # Hits are loaded without parsing
+            key = parsegc.content_key(StringIO(data))
+            self.assertEqual(list(cache.get(key)), expected)
+            self.assertEqual(parser.parse_data(StringIO(data)), expected)
+            self.assertEqual(list(parser.parse_data(StringIO(data), True)), 
+                expected)
+            self.assertEqual(parser.dispatch_counts[parsegc.YG_GC], 2)
+
+            log = os.path.join(tmp_dir, "gc.log")
+            with open(log, "w") as gclog:
+                gclog.write(data)
+            self.assertEqual(parser.parse_file(log), expected)
+            self.assertEqual(parser.dispatch_counts[parsegc.YG_GC], 2)
+
+            # Changed content misses
+            self.assertEqual(parser.parse_data(StringIO(data + '\n')), 
+                expected)
+            self.assertEqual(parser.dispatch_counts[parsegc.YG_GC], 4)
+
+            # Parsers forcing a profile don't share entries with others
+            no_details = ParseGCLog(cache=cache, 
+                profile=parsegc.get_profile(parsegc.NO_DETAILS, False))
+            self.assertEqual(no_details.parse_data(StringIO(data)), [])
+            self.assertEqual(parser.parse_data(StringIO(data)), expected)
+            self.assertEqual(no_details.parse_data(StringIO(data)), [])
+            self.assertNotEqual(key, parsegc.content_key(StringIO(data), 
+                no_details.profile))
+
+            # Least recently used entries are evicted
+            cache.max_size = os.path.getsize(cache._path(key))
+            cache._evict()
+            self.assertEqual(len(os.listdir(cache.directory)), 1)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_sniff_profile(self):
+        sniff = parsegc.sniff_profile
+        self.assertEqual(sniff([PARALLEL_ENTRY1, PARALLEL_MARKSWEEP_ADAPTIVE_FULL]), 
+            parsegc.get_profile(parsegc.PARALLEL, False))
+        self.assertEqual(sniff([PAR_NEW_ENTRY1, CMS_INITIAL_MARK]), 
+            parsegc.get_profile(parsegc.CMS, False))
+        self.assertEqual(sniff([SERIAL_ENTRY1, SERIAL_FULL]), 
+            parsegc.get_profile(parsegc.SERIAL, False))
+        self.assertEqual(sniff(["0.215: [GC 8192K->4616K(31360K), 0.0139870 secs]"]),
+            parsegc.get_profile(parsegc.NO_DETAILS, False))
+        # Inconclusive & mixed formats use the default profile
+        self.assertEqual(sniff([PAR_NEW_ENTRY1]), 
+            parsegc.get_profile(parsegc.DEFAULT, False))
+        self.assertEqual(sniff([PARALLEL_ENTRY1, SERIAL_FULL]), 
+            parsegc.get_profile(parsegc.DEFAULT, False))
+        self.assertEqual(sniff([]), parsegc.DEFAULT_PROFILE)
+
+        # -XX:+PrintGCDateStamps logs, also dated within entries
+        date = "2014-07-17T12:55:36.155+0200: "
+        lines = [date + "0.298: [GC" + date + "0.298: [ParNew: 17024K->2112K(19136K), 0.0126670 secs] 17024K->4060K(61312K), 0.0127620 secs] [Times: user=0.02 sys=0.00, real=0.01 secs] ",
+            date + CMS_INITIAL_MARK, date + PARNEW_CMS_FULL]
+        self.assertEqual(sniff(lines), parsegc.get_profile(parsegc.CMS, True))
+        results = self.parser.parse_data(StringIO('\n'.join(lines)))
+        self.assertEqual(self.parser.log_profile, 
+            parsegc.get_profile(parsegc.CMS, True))
+        self.assertEqual(results, [parsegc.generate_yg_gc_entry(
+            '0.298', '0.298', 'ParNew', '17024', '2112', '19136', 
+            '0.0126670', '17024', '4060', '61312', '0.0127620', 
+            '0.02', '0.00', '0.01'), self.parser.parse(PARNEW_CMS_FULL)])
+
+    def test_profile_parse(self):
+        """Each format's profile parses the same entries as the default"""
+        logs = [
+            [PARALLEL_MARKSWEEP_ADAPTIVE_YG1, PARALLEL_MARKSWEEP_ADAPTIVE_FULL,
+                PARALLEL_MARKSWEEP_NON_ADAPTIVE_SYSTEM],
+            [PARNEW_CMS_YG1, CMS_INITIAL_MARK, CMS_MARK_START, YG_OCCUPANCY,
+                COPY_CMS_YG1, PARNEW_CMS_FULL, PARNEW_CMS_SYSTEM],
+            [SERIAL_YG1, SERIAL_YG2, PARNEW_MSC_YG2, SERIAL_FULL, 
+                PARNEW_MSC_SYSTEM]]
+        for lines in logs:
+            data = '\n'.join(lines)
+            expected = [self.parser.parse(line) for line in lines 
+                if self.parser.parse(line)]
+            parser = ParseGCLog()
+            self.assertEqual(parser.parse_data(StringIO(data)), expected)
+            self.assertNotEqual(parser.log_profile.name, parsegc.DEFAULT)
+            frame = parser.parse_data(StringIO(data), True)
+            self.assertEqual(list(frame), expected)
+
+    def test_wall_time(self):
+        decode = parsegc.DatestampDecoder()
+        self.assertEqual(decode(''), 0.0)
+        self.assertEqual(decode(None), 0.0)
+        # 2014-07-17T10:55:36.155 UTC
+        self.assertAlmostEqual(decode('2014-07-17T12:55:36.155+0200'), 
+            1405594536.155)
+        # Within the cached hour
+        self.assertAlmostEqual(decode('2014-07-17T12:59:01.001+0200'), 
+            1405594741.001)
+        self.assertAlmostEqual(decode('2014-07-17T05:25:36.155-0530'), 
+            1405594536.155)
+
+        date = "2014-07-17T12:55:36.155+0200: "
+        lines = [date + SERIAL_ENTRY1, date + SERIAL_FULL, SERIAL_FULL]
+        entries = self.parser.parse_data(StringIO('\n'.join(lines)))
+        self.assertEqual([entry.wall_time for entry in entries], 
+            [1405594536.155, 1405594536.155, 0.0])
+        self.assertEqual(self.parser.parse(SERIAL_ENTRY1).wall_time, 0.0)
+        self.assertEqual(pickle.loads(pickle.dumps(entries[0])).wall_time,
+            entries[0].wall_time)
+
+        frame = self.parser.parse_data(StringIO('\n'.join(lines)), True)
+        self.assertEqual(list(frame.column('wall_time')), 
+            [1405594536.155, 1405594536.155, 0.0])
+        self.assertEqual([entry.wall_time for entry in frame], 
+            [entry.wall_time for entry in entries])
+        self.assertEqual([entry.wall_time for entry in 
+            self.parser.iter_parse_batched(StringIO('\n'.join(lines)))], 
+            [entry.wall_time for entry in entries])
+
+    def test_parse_range(self):
+        tmp_dir = tempfile.mkdtemp()
+        interval = parsegc.INDEX_INTERVAL
+        parsegc.INDEX_INTERVAL = 3
+        try:
+            log = os.path.join(tmp_dir, "gc.log")
+            with open(log, "w") as gclog:
+                for i in range(20):
+                    gclog.write("%d.000: [GC %d.000: [ParNew: 471872K->50601K(471872K), 0.1122560 secs] 2294220K->1911156K(4141888K), 0.1127720 secs] [Times: user=2.47 sys=0.09, real=0.12 secs] \n" % (i, i))
+                    gclog.write(CMS_MARK_START + "\n")
+            entries = self.parser.parse_file(log)
+
+            def window(t_start, t_end):
+                return [entry for entry in entries 
+                    if t_start <= entry.timestamp <= t_end]
+
+            # The index is built on first use
+            self.assertEqual(self.parser.parse_range(log, 4, 7), 
+                window(4, 7))
+            offsets, timestamps = parsegc.read_index(log)
+            self.assertEqual(timestamps, [0.0, 3.0, 6.0, 9.0, 12.0, 15.0, 
+                18.0])
+
+            for t_start, t_end in ((4, 7), (3, 3), (-1, 2), (17.5, 100), 
+                    (6.5, 6.6), (0, 19)):
+                self.assertEqual(self.parser.parse_range(log, t_start, 
+                    t_end), window(t_start, t_end))
+            self.assertEqual(list(self.parser.parse_range(log, 4, 7, True)),
+                window(4, 7))
+
+            # Only the indexed range is parsed
+            parser = ParseGCLog()
+            parser.parse_range(log, 7, 8)
+            self.assertEqual(parser.dispatch_counts[parsegc.YG_GC], 3)
+
+            # Replaced logs are reindexed
+            with open(log, "w") as gclog:
+                gclog.write(SERIAL_ENTRY1 + "\n")
+            self.assertEqual(parsegc.read_index(log), None)
+            self.assertEqual(self.parser.parse_range(log, 0, 100), 
+                [self.parser.parse(SERIAL_ENTRY1)])
+        finally:
+            parsegc.INDEX_INTERVAL = interval
+            shutil.rmtree(tmp_dir)
+
+    def test_parse_file_window(self):
+        tmp_dir = tempfile.mkdtemp()
+        span = parsegc.BISECT_SPAN
+        parsegc.BISECT_SPAN = 64
+        try:
+            log = os.path.join(tmp_dir, "gc.log")
+            lines = []
+            for i in range(50):
+                lines.append("%d.000: [GC %d.000: [ParNew: 471872K->50601K(471872K), 0.1122560 secs] 2294220K->1911156K(4141888K), 0.1127720 secs] [Times: user=2.47 sys=0.09, real=0.12 secs] " % (i, i))
+                lines.append("%d.500: [CMS-concurrent-mark-start]" % i)
+                lines.append("untimestamped noise")
+            with open(log, "w") as gclog:
+                gclog.write('\n'.join(lines))
+            entries = self.parser.parse_file(log)
+
+            data = '\n'.join(lines).encode('ascii')
+            for t in (-1, 0, 0.5, 10, 25, 49, 50, 100):
+                pos = parsegc.bisect_offset(data, t)
+                self.assertTrue(pos == 0 or data[pos - 1:pos] == b'\n')
+                before = self.parser.parse_data(StringIO(
+                    data[:pos].decode('ascii')))
+                self.assertTrue(all(entry.timestamp < t for entry in before))
+
+            for start, end in ((10, 20), (None, 5), (45, None), (7.5, 7.9), 
+                    (60, 70)):
+                parser = ParseGCLog()
+                self.assertEqual(parser.parse_file(log, start=start, 
+                    end=end), [entry for entry in entries if 
+                    (start is None or entry.timestamp >= start) and 
+                    (end is None or entry.timestamp <= end)])
+                # Only around the window is parsed
+                self.assertTrue(parser.dispatch_counts[parsegc.YG_GC] < 20)
+            self.assertFalse(os.path.exists(parsegc.index_path(log)))
+        finally:
+            parsegc.BISECT_SPAN = span
+            shutil.rmtree(tmp_dir)
+
+    def test_iter_merge(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            def entry_line(ts, collector="ParNew"):
+                return "%.3f: [GC %.3f: [%s: 471872K->50601K(471872K), 0.1122560 secs] 2294220K->1911156K(4141888K), 0.1127720 secs] [Times: user=2.47 sys=0.09, real=0.12 secs] " % (ts, ts, collector)
+
+            def write_log(name, lines):
+                path = os.path.join(tmp_dir, name)
+                with open(path, "w") as gclog:
+                    gclog.write('\n'.join(lines) + '\n')
+                return path
+
+            # Rotation wrapped around to gc.log.0, with gc.log.1 & gc.log.2
+            # overlapping at 4.0
+            jvm1 = [write_log("gc.log.0", [entry_line(7), entry_line(8)]),
+                write_log("gc.log.1", [entry_line(1), CMS_MARK_START, 
+                    entry_line(3), entry_line(4)]),
+                write_log("gc.log.2", [entry_line(4), entry_line(5)])]
+            jvm2 = [write_log("jvm2.log", [entry_line(2, "DefNew"), 
+                entry_line(4, "DefNew"), entry_line(6, "DefNew")])]
+
+            merged = list(self.parser.iter_merge({'a': jvm1, 'b': jvm2}))
+            self.assertEqual([(source, entry.timestamp) 
+                for source, entry in merged], 
+                [('a', 1), ('b', 2), ('a', 3), ('a', 4), ('b', 4), ('a', 5), 
+                ('b', 6), ('a', 7), ('a', 8)])
+            self.assertEqual(merged[4][1].collector, "DefNew")
+
+            # Each file as a source
+            merged = list(self.parser.iter_merge(jvm1[:2]))
+            self.assertEqual([entry.timestamp for source, entry in merged],
+                [1, 3, 4, 7, 8])
+            self.assertEqual(merged[0][0], jvm1[1])
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_lazy_entries(self):
+        lines = [SERIAL_ENTRY1, CMS_MARK_START, PARALLEL_ENTRY1, 
+            PARNEW_CMS_FULL, PARALLEL_MARKSWEEP_ADAPTIVE_SYSTEM]
+        data = '\n'.join(lines)
+        expected = self.parser.parse_data(StringIO(data))
+
+        parser = ParseGCLog(lazy=True)
+        entries = parser.parse_data(StringIO(data))
+        self.assertTrue(isinstance(entries[0], parsegc.LazyYoungGenGCEntry))
+        self.assertTrue(isinstance(entries[0], YoungGenGCEntry))
+        self.assertTrue(isinstance(entries[2], parsegc.LazyFullGCEntry))
+
+        # Fields are decoded & cached on first access
+        self.assertEqual(entries[0].pause_time, expected[0].pause_time)
+        self.assertEqual(entries[0].pause_time, expected[0].pause_time)
+        entries[1].collector = "Renamed"
+        self.assertEqual(entries[1].collector, "Renamed")
+        entries[1].collector = expected[1].collector
+
+        self.assertEqual(entries, expected)
+        self.assertEqual([entry.get_attr() for entry in entries], 
+            [entry.get_attr() for entry in expected])
+        self.assertEqual(entries[3].system, True)
+        self.assertEqual(pickle.loads(pickle.dumps(entries)), expected)
+        self.assertEqual(parser.parse(SERIAL_ENTRY1), expected[0])
+
+    def test_collector_codes(self):
+        # Codes are persisted, so the table may only be appended to
+        self.assertEqual(parsegc.COLLECTORS[:5], 
+            ('ParNew', 'DefNew', 'PSYoungGen', 'CMS', 'Tenured'))
+        for code, name in enumerate(parsegc.COLLECTORS):
+            self.assertEqual(parsegc.collector_code(name), code)
+            self.assertEqual(parsegc.collector_name(code), name)
+        self.assertEqual(parsegc.collector_code("Shenandoah"), None)
+
+        # Entries of a collector share one interned name, however parsed
+        data = "\n".join([PAR_NEW_ENTRY1, PARNEW_CMS_FULL, PAR_NEW_ENTRY1])
+        name = parsegc.collector_name(parsegc.collector_code("ParNew"))
+        for entries in (self.parser.parse_data(StringIO(data)), 
+                self.parser.parse_data(StringIO(data), columnar=True), 
+                ParseGCLog(lazy=True).parse_data(StringIO(data)), 
+                ParseGCLog(tokenizer=True).parse_data(StringIO(data)), 
+                list(self.parser.iter_parse_buffer(data.encode('ascii')))):
+            self.assertTrue(entries[0].collector is name)
+            self.assertTrue(entries[2].collector is name)
+        self.assertTrue(parsegc.intern_collector(b"CMS") is 
+            parsegc.COLLECTORS[3])
+
+    def test_tokenizer(self):
+        lines = [value for name, value in sorted(globals().items()) 
+            if name.isupper() and isinstance(value, str)]
+        parser = ParseGCLog(tokenizer=True)
+        for line in lines:
+            self.assertEqual(parser.parse(line), self.parser.parse(line))
+            # Truncated & malformed lines are rejected alike
+            for end in range(0, len(line), 7):
+                self.assertEqual(parser.parse(line[:end]), 
+                    self.parser.parse(line[:end]))
+            self.assertEqual(parser.parse(line.replace('K->', 'K-> ')), 
+                self.parser.parse(line.replace('K->', 'K-> ')))
+            # The space following "[GC" is only optional in date stamped 
+            # logs, e.g. "[Full GC26.256: ..." is rejected
+            unspaced = line.replace('GC ', 'GC')
+            self.assertEqual(parser.parse(unspaced), 
+                self.parser.parse(unspaced))
+            dated = "2014-07-17T12:55:36.155+0200: " + unspaced
+            for datestamps in (True, False):
+                profile = parsegc.get_profile(parsegc.DEFAULT, datestamps)
+                tokenizing = ParseGCLog(tokenizer=True, profile=profile)
+                matching = ParseGCLog(profile=profile)
+                for variant in (unspaced, dated):
+                    self.assertEqual(tokenizing.parse(variant), 
+                        matching.parse(variant))
 
+        data = '\n'.join(lines)
+        self.assertEqual(parser.parse_data(StringIO(data)), 
+            self.parser.parse_data(StringIO(data)))
+        self.assertEqual(
+            ParseGCLog(tokenizer=True, lazy=True).parse_data(StringIO(data)), 
+            self.parser.parse_data(StringIO(data)))
+        self.assertEqual(
+            list(parser.iter_parse_batched(StringIO(data))), 
+            self.parser.parse_data(StringIO(data)))
+        self.assertEqual(parsegc.tokenize_yg_gc(CMS_MARK_START), None)
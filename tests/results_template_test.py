@@ -0,0 +1,39 @@
+import os
+import unittest
+
+import jinja2
+
+from parsegc import ParseGCLog
+
+class ResultsTemplateTest(unittest.TestCase):
+    """Test cases for rendering the results page"""
+
+    path = os.path.dirname(os.path.abspath(__file__)) + "/"
+
+    def setUp(self):
+        self.environment = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(self.path + ".."))
+        self.template = self.environment.get_template(
+            'static/templates/results.html')
+
+    def test_render_stored_upload(self):
+        """Stored uploads, as served by GetUploadHandler, have no parse
+        diagnostics
+        """
+        page = self.template.render({
+            'summary_stats': {},
+            'gc_results': [],
+            'duration': 0.0})
+        self.assertTrue('GC activity summary' in page)
+        self.assertFalse('Parse Diagnostics' in page)
+
+    def test_render_diagnostics(self):
+        parser = ParseGCLog()
+        gc_results = parser.parse_file(self.path + "gc-sample.log")
+        page = self.template.render({
+            'summary_stats': {},
+            'gc_results': gc_results,
+            'duration': 0.0,
+            'diagnostics': parser.diagnostics})
+        self.assertTrue('Parse Diagnostics' in page)
+        self.assertTrue('bytes scanned' in page)
@@ -1,12 +1,26 @@
+import math
+import random
 import unittest
 
 import parsegc
 import stats
 
 from parsegc import FullGCEntry, YoungGenGCEntry
-from stats import IntStats, FloatStats, SummaryStats
+from stats import IntStats, FloatStats, QuantileHistogram, RateStats, \
+    SummaryStats, WindowStats
 
 class StatsTest(unittest.TestCase):
+    def assertAccumulatorEqual(self, accumulator, expected):
+        values = vars(accumulator)
+        for key, value in vars(expected).items():
+            if key in ('mean', 'm2'):
+                self.assertAlmostEqual(values[key] / (value or 1), 
+                    1.0 if value else 0.0)
+            elif hasattr(value, '__dict__'):
+                self.assertAccumulatorEqual(values[key], value)
+            else:
+                self.assertEqual(values[key], value)
+
     def test_intstats(self):
         values = [10, 99, 1, 2, 3, 4, 5]
 
@@ -37,8 +51,9 @@ class StatsTest(unittest.TestCase):
         self.assertEqual(stats.first, -10)
         self.assertEqual(stats.last, 5)
         self.assertEqual(stats.total, -94)
-        # You loose precision calculating moving average with integer values
-        self.assertEqual(stats.average, -14)
+        # The average is of integer division of the exact total, rather 
+        # than a moving average accumulating rounding errors
+        self.assertEqual(stats.average, -12)
 
     def test_floatstats(self):
         values = [10.0, 99.0, 1.0, 2.0, 3.0, 4.0, 5.0]
@@ -72,6 +87,271 @@ class StatsTest(unittest.TestCase):
         self.assertEqual(stats.total, -94.0)
         self.assertEqual(stats.average, sum(values) / len(values))
 
+    def test_stats_merge(self):
+        values = [-10.0, -99.0, 1.0, 2.0, 3.0, 4.0, 0.0, 5.0]
+        mean = sum(values) / len(values)
+
+        expected = FloatStats()
+        for value in values:
+            expected.process(value)
+        self.assertAlmostEqual(expected.mean, mean)
+        self.assertAlmostEqual(expected.variance, 
+            sum((value - mean) ** 2 for value in values) / len(values))
+
+        for split in range(len(values) + 1):
+            for stats_type in (IntStats, FloatStats):
+                parts = [stats_type(), stats_type(), stats_type()]
+                for value in values[:split]:
+                    parts[0].process(value)
+                for value in values[split:]:
+                    parts[2].process(value)
+                # Merging is associative, & empty stats are identities
+                merged = parts[0]
+                merged.merge(parts[1])
+                parts[1].merge(parts[2])
+                merged.merge(parts[1])
+
+                self.assertEqual(merged.count, len(values))
+                self.assertEqual(merged.min, -99.0)
+                self.assertEqual(merged.max, 5.0)
+                self.assertEqual(merged.first, -10.0)
+                self.assertEqual(merged.last, 5.0)
+                self.assertEqual(merged.total, -94.0)
+                self.assertEqual(merged.average, expected.average)
+                self.assertAlmostEqual(merged.mean, expected.mean)
+                self.assertAlmostEqual(merged.variance, expected.variance)
+
+    def test_quantile_histogram(self):
+        generator = random.Random(0)
+        values = [generator.lognormvariate(-3, 1.5) for i in range(10000)]
+        values += [0.0] * 10
+        histogram = QuantileHistogram()
+        parts = [QuantileHistogram() for i in range(3)]
+        for i, value in enumerate(values):
+            histogram.process(value)
+            parts[i % 3].process(value)
+
+        ordered = sorted(values)
+        qs = [0.0, 0.001, 0.5, 0.9, 0.99, 0.999, 1.0]
+        for q, value in zip(qs, histogram.quantiles(qs)):
+            exact = ordered[max(int(math.ceil(q * len(ordered))), 1) - 1]
+            self.assertTrue(abs(value - exact) <= 0.01 * exact, 
+                (q, value, exact))
+        self.assertEqual(histogram.max, ordered[-1])
+        self.assertEqual(histogram.quantile(1.0), ordered[-1])
+        self.assertEqual(histogram.quantile(0.0), 0.0)
+        # Memory is bounded by the range of values, not their number
+        self.assertTrue(len(histogram.buckets) < 2000)
+
+        merged = QuantileHistogram()
+        for part in parts:
+            merged.merge(part)
+        self.assertEqual(merged.buckets, histogram.buckets)
+        self.assertEqual(merged.quantiles(qs), histogram.quantiles(qs))
+        self.assertEqual(QuantileHistogram().quantiles(qs), [0.0] * len(qs))
+
+        # Negative values are counted in mirrored buckets, & values of 
+        # magnitude below min_value reported as 0
+        values = [-generator.lognormvariate(0, 1) for i in range(3000)]
+        values += [0.0] * 1000
+        values += [generator.lognormvariate(0, 1) for i in range(6000)]
+        generator.shuffle(values)
+        histogram = QuantileHistogram()
+        for value in values:
+            histogram.process(value)
+        ordered = sorted(values)
+        qs = [0.0, 0.1, 0.3, 0.35, 0.4, 0.5, 0.9, 1.0]
+        for q, value in zip(qs, histogram.quantiles(qs)):
+            exact = ordered[max(int(math.ceil(q * len(ordered))), 1) - 1]
+            self.assertTrue(abs(value - exact) <= 0.01 * abs(exact), 
+                (q, value, exact))
+        self.assertEqual(histogram.quantile(0.35), 0.0)
+
+        histogram = QuantileHistogram()
+        for value in (-100.0, 0.0, 0.0, 0.0, 5.0):
+            histogram.process(value)
+        self.assertEqual(histogram.quantiles([0.2, 0.5, 1.0]), 
+            [-100.0, 0.0, 5.0])
+        histogram = QuantileHistogram()
+        for value in (-3.0, -2.0):
+            histogram.process(value)
+        self.assertEqual(histogram.max, -2.0)
+        self.assertAlmostEqual(histogram.quantile(1.0), -2.0, delta=0.02)
+
+    def test_rate_stats(self):
+        def yg_gc(timestamp, yg_util_pre, yg_util_post, heap_util_pre, 
+                heap_util_post):
+            return parsegc.generate_yg_gc_entry(timestamp, timestamp, 
+                "ParNew", yg_util_pre, yg_util_post, "8192", "0.1", 
+                heap_util_pre, heap_util_post, "65536", "0.1", "0.1", "0.0", 
+                "0.1")
+
+        entries = [
+            yg_gc("1.0", "6144", "1024", "16384", "12288"),
+            # 4 MB allocated & 1 MB promoted over 2 secs
+            yg_gc("3.0", "5120", "1024", "16384", "13312"),
+            # Nothing elapsed, so no rates
+            yg_gc("3.0", "2048", "1024", "14336", "13312"),
+            # 7 MB allocated & 2 MB promoted over 0.5 secs
+            yg_gc("3.5", "8192", "1024", "20480", "15360")]
+        rates = RateStats()
+        self.assertEqual([rates.process(entry) for entry in entries], 
+            [None, (2 << 20, 1 << 19), None, (14 << 20, 4 << 20)])
+        self.assertEqual(rates.allocation.min, 2 << 20)
+        self.assertEqual(rates.allocation.average, 8 << 20)
+        self.assertEqual(rates.promotion.max, 4 << 20)
+        self.assertAlmostEqual(rates.allocation_quantiles.quantile(0.99) / 
+            (14 << 20), 1.0, delta=0.01)
+
+        # Merged rates include the interval spanning the entries merged
+        for split in range(len(entries) + 1):
+            head, tail = RateStats(), RateStats()
+            for entry in entries[:split]:
+                head.process(entry)
+            for entry in entries[split:]:
+                tail.process(entry)
+            head.merge(tail)
+            self.assertAccumulatorEqual(head, rates)
+
+        summary = SummaryStats(entries).stats
+        self.assertEqual(summary['Allocation Rate Min / Avg / p99'], 
+            '2.00 MB / 8.00 MB / 14.00 MB/sec')
+        self.assertEqual(summary['Promotion Rate Min / Avg / p99'], 
+            '512.00 KB / 2.25 MB / 4.00 MB/sec')
+
+    def test_window_stats(self):
+        def gc(timestamp, pause_time):
+            return parsegc.generate_yg_gc_entry(timestamp, timestamp, 
+                "ParNew", "2", "1", "4", pause_time, "2048", "1024", "4096", 
+                pause_time, "0.1", "0.0", pause_time)
+
+        entries = [gc("0.0", "0.5"), gc("1.0", "0.25"), gc("1.5", "0.25"), 
+            gc("10.0", "1.0"), gc("11.75", "0.5")]
+        overhead = WindowStats(2)
+        # The window ending at the last pause includes 0.75 secs of the 
+        # pause before
+        self.assertEqual([overhead.process(entry) for entry in entries], 
+            [(0.25, 1), (0.375, 2), (0.5, 3), (0.5, 1), (0.625, 2)])
+        self.assertEqual(overhead.max_overhead, 0.625)
+        self.assertEqual(overhead.worst_end, 12.25)
+        self.assertEqual(overhead.max_collections, 3)
+        self.assertEqual([pause[0] for pause in overhead.pauses], 
+            [10.0, 11.75])
+
+        # Merged stats include the windows spanning the pauses merged, 
+        # including those of overlapping pauses
+        def split_merge(entries, split, window):
+            head, tail = WindowStats(window), WindowStats(window)
+            for entry in entries[:split]:
+                head.process(entry)
+            for entry in entries[split:]:
+                tail.process(entry)
+            head.merge(tail)
+            return head
+
+        def assertMerged(merged, expected):
+            self.assertAlmostEqual(merged.max_overhead, expected.max_overhead)
+            self.assertEqual(merged.worst_end, expected.worst_end)
+            self.assertEqual(merged.max_collections, expected.max_collections)
+            self.assertEqual(merged.count, expected.count)
+            self.assertEqual(merged.end, expected.end)
+            self.assertEqual(merged.head, expected.head)
+            self.assertEqual([pause[:5] for pause in merged.pauses], 
+                [pause[:5] for pause in expected.pauses])
+
+        entries = [gc("0.0", "1.94"), gc("0.32", "2.12"), gc("1.33", "2.2")]
+        later = [gc("3.6", "0.3"), gc("3.8", "0.1"), gc("5.0", "0.2")]
+        expected = WindowStats(1)
+        for entry in entries:
+            expected.process(entry)
+        self.assertEqual(expected.max_collections, 2)
+        for split in range(len(entries) + 1):
+            merged = split_merge(entries, split, 1)
+            assertMerged(merged, expected)
+            # & stay so as further pauses are processed
+            self.assertEqual([merged.process(entry) for entry in later], 
+                [expected.process(entry) for entry in later])
+            expected = WindowStats(1)
+            for entry in entries:
+                expected.process(entry)
+
+        generator = random.Random(0)
+        entries = []
+        timestamp = 0.0
+        for i in range(200):
+            timestamp += generator.expovariate(2)
+            entries.append(gc(str(timestamp), "%.4f" % 
+                generator.expovariate(2)))
+        expected = WindowStats(10)
+        for entry in entries:
+            expected.process(entry)
+        rejected = []
+        for split in range(len(entries) + 1):
+            try:
+                merged = split_merge(entries, split, 10)
+            except ValueError:
+                # Only where a pause before the split outlasts the first 
+                # after it, which may overlap pauses not kept
+                rejected.append(split)
+                self.assertTrue(max(entry.timestamp + entry.pause_time 
+                    for entry in entries[:split]) > 
+                    entries[split].timestamp + entries[split].pause_time)
+                continue
+            assertMerged(merged, expected)
+        self.assertTrue(rejected)
+
+        # SummaryStats are checked before any of their stats are merged
+        split = rejected[0]
+        head = SummaryStats(entries[:split], windows=(1, 10))
+        tail = SummaryStats(entries[split:], windows=(1, 10))
+        stats = dict(head.stats)
+        self.assertRaises(ValueError, head.merge, tail)
+        self.assertRaises(ValueError, SummaryStats.from_partials, 
+            [head, tail])
+        self.assertEqual(head.events, split)
+        self.assertEqual(head.yg_pauses.count, split)
+        self.assertEqual([overhead.count for overhead in head.overheads], 
+            [split, split])
+        self.assertEqual(head.stats, stats)
+        self.assertRaises(ValueError, head.merge, SummaryStats(windows=(1,)))
+
+    def test_from_frame(self):
+        generator = random.Random(0)
+        entries = []
+        for i in range(500):
+            sizes = [str(generator.randint(0, 1 << 20)) for j in range(9)]
+            times = ["%.7f" % generator.expovariate(20) for j in range(5)]
+            if generator.random() < 0.9:
+                entries.append(parsegc.generate_yg_gc_entry(str(i), str(i), 
+                    "ParNew", *(sizes[:3] + times[:1] + sizes[3:6] + 
+                        times[1:])))
+            else:
+                entries.append(parsegc.generate_full_gc_entry(str(i), 
+                    str(i), "CMS", *(sizes[:3] + times[:1] + sizes[3:] + 
+                        times[1:])))
+        frame = parsegc.GCFrame.from_entries(entries)
+        expected = SummaryStats(entries)
+
+        summaries = [SummaryStats.from_frame(frame)]
+        # Without NumPy, the rows of the frame are walked
+        numpy, stats.numpy = stats.numpy, None
+        try:
+            summaries.append(SummaryStats.from_frame(frame))
+        finally:
+            stats.numpy = numpy
+
+        for summary in summaries:
+            self.assertEqual(list(summary.stats.items()), 
+                list(expected.stats.items()))
+            for name in SummaryStats._accumulators:
+                self.assertAccumulatorEqual(getattr(summary, name), 
+                    getattr(expected, name))
+            for overhead, expected_overhead in zip(summary.overheads, 
+                    expected.overheads):
+                self.assertAccumulatorEqual(overhead, expected_overhead)
+        self.assertEqual(SummaryStats.from_frame(parsegc.GCFrame()).stats, 
+            SummaryStats().stats)
+
     def test_int_bytes_human_readable(self):
         self.assertEqual(stats.int_bytes_human_readable(0),  "0 B")
         self.assertEqual(stats.int_bytes_human_readable(1),  "1 B")
@@ -91,6 +371,7 @@ class StatsTest(unittest.TestCase):
         self.assertEqual(stats.float_bytes_human_readable(1 << 40),  "1.00 TB")
         self.assertEqual(stats.float_bytes_human_readable(1 << 50),  "1024.00 TB")
         self.assertEqual(stats.float_bytes_human_readable(1 << 64),  "16777216.00 TB")
+        self.assertEqual(stats.float_bytes_human_readable(-(1 << 20)),  "-1.00 MB")
 
     def test_generate_stats(self):
         """Test the generation of stats result set"""
@@ -174,6 +455,20 @@ class StatsTest(unittest.TestCase):
         expected['Elapsed Time'] = '200.750  secs'
         expected['Time spent in Full GC'] = '7.215  secs'
         expected['Time spent in YG GC'] = '5.247  secs'
+        # Percentiles are within 1% of the pause of their rank
+        expected['YG Pause p50 / p90 / p99 / p99.9 (Max)'] = \
+            '2.123 / 3.096 / 3.096 / 3.096 (3.123) secs'
+        expected['Full Pause p50 / p90 / p99 / p99.9 (Max)'] = \
+            '3.123 / 4.091 / 4.091 / 4.091 (4.091) secs'
+        expected['Allocation Rate Min / Avg / p99'] = \
+            '40.76 B / 40.76 B / 40.76 B/sec'
+        # The only promotion rate, negative as more of the heap than the 
+        # YG was reclaimed
+        expected['Promotion Rate Min / Avg / p99'] = \
+            '-61.11 KB / -61.11 KB / -61.11 KB/sec'
+        expected['Worst GC Overhead 1s / 10s / 60s'] = \
+            '100.00% at 52.123 / 40.91% at 254.841 / 12.02% at 254.841 secs'
+        expected['Max Collections per 1s / 10s / 60s'] = '1 / 1 / 2'
         expected['Heap Start / End (Peak)'] = '4 MB / 8 MB (16 MB)'
         expected['YG Start / End (Peak)'] = '4 KB / 8 KB (8 KB)'
         expected['Tenured Start / End (Peak)'] = '40 KB / 80 KB (80 KB)'
@@ -186,3 +481,20 @@ class StatsTest(unittest.TestCase):
         expected['Avg Tenured Reclaimed'] = '10 KB'
 
         self.assertEqual(results, expected)
+
+        # Stats are generated in a single pass, so can be streamed
+        streamed = SummaryStats(iter(gc_data)).stats
+        self.assertEqual(streamed, expected)
+
+        # Stats can be updated incrementally
+        incremental = SummaryStats(gc_data[:1])
+        incremental.update(gc_data[1:3])
+        incremental.update(gc_data[3:])
+        self.assertEqual(incremental.stats, expected)
+
+        # Stats of consecutive parts combine
+        for split in range(len(gc_data) + 1):
+            merged = SummaryStats.from_partials([SummaryStats(
+                gc_data[:split]), SummaryStats(), SummaryStats(
+                gc_data[split:])])
+            self.assertEqual(merged.stats, expected)